@@ -6,6 +6,8 @@ import re
 import cssutils
 from pathlib import Path
 from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, List, Set, Tuple, Any
 import logging
 import warnings
@@ -17,6 +19,22 @@ logger = logging.getLogger(__name__)
 # Suppress cssutils warnings
 warnings.filterwarnings('ignore', module='cssutils')
 
+# Class/ID names inside selector text
+_SELECTOR_CLASS_RE = re.compile(r'\.([a-zA-Z0-9_-]+)')
+_SELECTOR_ID_RE = re.compile(r'#([a-zA-Z0-9_-]+)')
+# camelCase/PascalCase word chunks (numeric runs are their own chunk)
+_CAMEL_CHUNK_RE = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|[0-9]+')
+
+@lru_cache(maxsize=8192)
+def _attr_usage_re(attr: str, name: str) -> re.Pattern:
+    """Compiled pattern for a name inside a class/id attribute.
+
+    Projects easily have more selectors than re's internal cache (512 entries)
+    holds, so per-name patterns are kept here instead of being recompiled for
+    every source file.
+    """
+    return re.compile(rf'\b{attr}\b[^>]*\b{re.escape(name)}\b', re.IGNORECASE)
+
 class BaseAnalyzer:
     """Base class for all analyzers."""
     
@@ -394,7 +412,7 @@ class UnusedSelectorAnalyzer(BaseAnalyzer):
                     line = self._get_line_number(css_content, rule.selectorText, str(css_file))
                     
                     # Extract class selectors
-                    class_matches = re.findall(r'\.([a-zA-Z0-9_-]+)', selector_text)
+                    class_matches = _SELECTOR_CLASS_RE.findall(selector_text)
                     for match in class_matches:
                         if match not in self.excluded_selectors:
                             selector = f".{match}"
@@ -404,7 +422,7 @@ class UnusedSelectorAnalyzer(BaseAnalyzer):
                             })
                     
                     # Extract ID selectors
-                    id_matches = re.findall(r'#([a-zA-Z0-9_-]+)', selector_text)
+                    id_matches = _SELECTOR_ID_RE.findall(selector_text)
                     for match in id_matches:
                         if match not in self.excluded_selectors:
                             selector = f"#{match}"
@@ -421,7 +439,7 @@ class UnusedSelectorAnalyzer(BaseAnalyzer):
                             line = self._get_line_number(css_content, inner_rule.selectorText, str(css_file))
                             
                             # Extract class selectors
-                            class_matches = re.findall(r'\.([a-zA-Z0-9_-]+)', selector_text)
+                            class_matches = _SELECTOR_CLASS_RE.findall(selector_text)
                             for match in class_matches:
                                 if match not in self.excluded_selectors:
                                     selector = f".{match}"
@@ -431,7 +449,7 @@ class UnusedSelectorAnalyzer(BaseAnalyzer):
                                     })
                             
                             # Extract ID selectors
-                            id_matches = re.findall(r'#([a-zA-Z0-9_-]+)', selector_text)
+                            id_matches = _SELECTOR_ID_RE.findall(selector_text)
                             for match in id_matches:
                                 if match not in self.excluded_selectors:
                                     selector = f"#{match}"
@@ -473,14 +491,12 @@ class UnusedSelectorAnalyzer(BaseAnalyzer):
         """Check if a class is used in the content."""
         # Look for class attribute containing the class name (case-insensitive)
         # This is a simple heuristic that searches within a tag's attributes.
-        pattern = rf'\bclass\b[^>]*\b{re.escape(class_name)}\b'
-        return bool(re.search(pattern, content, flags=re.IGNORECASE))
+        return bool(_attr_usage_re('class', class_name).search(content))
     
     def _find_id_usage(self, content: str, id_name: str) -> bool:
         """Check if an ID is used in the content."""
         # Look for id attribute containing the id name (case-insensitive)
-        pattern = rf'\bid\b[^>]*\b{re.escape(id_name)}\b'
-        return bool(re.search(pattern, content, flags=re.IGNORECASE))
+        return bool(_attr_usage_re('id', id_name).search(content))
     
     def analyze(self, css_files: List[Path], source_files: List[Path], page_map: Dict[str, Any] = None, per_page_unused: bool = False, skip_unreferenced: bool = False) -> Dict[str, Any]:
         """Analyze for unused CSS selectors."""
@@ -489,6 +505,10 @@ class UnusedSelectorAnalyzer(BaseAnalyzer):
             'used_selectors': set(),
             'total_selectors': 0,
             'usage_percentage': 0,
+            # Sizes of the collections above, so reporters don't recount them
+            'used_selectors_count': 0,
+            'unused_selectors_count': 0,
+            'unused_occurrences_count': 0,
             'errors': []
         }
         if page_map:
@@ -541,10 +561,13 @@ class UnusedSelectorAnalyzer(BaseAnalyzer):
         # Calculate unused selectors with locations
         unused_selectors = {k: v for k, v in css_selectors.items() if k not in results['used_selectors']}
         results['unused_selectors'] = unused_selectors
+        results['used_selectors_count'] = len(results['used_selectors'])
+        results['unused_selectors_count'] = len(unused_selectors)
+        results['unused_occurrences_count'] = sum(len(v) for v in unused_selectors.values())
         
         # Calculate usage percentage
         if css_selectors:
-            results['usage_percentage'] = (len(results['used_selectors']) / len(css_selectors)) * 100
+            results['usage_percentage'] = (results['used_selectors_count'] / len(css_selectors)) * 100
         
         results['errors'] = self.errors
         
@@ -625,8 +648,11 @@ class StructureAnalyzer(BaseAnalyzer):
                 elif isinstance(rule, cssutils.css.CSSComment):
                     # Collect comments with correct line number
                     line = self._get_line_number(css_content, rule.cssText, str(css_file))
+                    text = rule.cssText
                     comment_info = {
-                        'text': rule.cssText,
+                        'text': text,
+                        # Truncated form shown by reporters unless --full
+                        'preview': text[:80] + "..." if len(text) > 80 else text,
                         'file': str(Path(css_file).resolve()),
                         'line': line
                     }
@@ -638,6 +664,13 @@ class StructureAnalyzer(BaseAnalyzer):
             results['load_order'] = {page: (info.get('css_chain', []) or []) for page, info in pages.items()}
         results['analyzed_files'] = [str(Path(p).resolve()) for p in css_files]
 
+        # Prefixes seen at least twice, most frequent first; sorted once here for all reporters
+        results['prefixes_ranked'] = sorted(
+            ((p, c) for p, c in results['prefixes'].items() if c >= 2),
+            key=itemgetter(1),
+            reverse=True,
+        )
+
         results['errors'] = self.errors
         return results
 
@@ -656,8 +689,8 @@ class StructureAnalyzer(BaseAnalyzer):
         - Numeric suffixes are handled via tokenization: e.g., "body1" -> ["body"].
         """
         # Extract class and id names
-        class_matches = re.findall(r'\.([a-zA-Z0-9_-]+)', selector_text)
-        id_matches = re.findall(r'#([a-zA-Z0-9_-]+)', selector_text)
+        class_matches = _SELECTOR_CLASS_RE.findall(selector_text)
+        id_matches = _SELECTOR_ID_RE.findall(selector_text)
 
         def record(name: str, kind: str):
             prefixes_to_add: list[str] = []
@@ -670,7 +703,7 @@ class StructureAnalyzer(BaseAnalyzer):
                         prefixes_to_add.append("_".join(all_parts[:i]))
             else:
                 # Camel/PascalCase tokenization (includes numeric chunks)
-                chunks = re.findall(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|[0-9]+', name)
+                chunks = _CAMEL_CHUNK_RE.findall(name)
                 # Need at least two chunks; build cumulative prefixes up to n-1
                 if len(chunks) >= 2:
                     chunks_lower = [c.lower() for c in chunks]
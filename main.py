@@ -13,8 +13,8 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from analyzers import DuplicateAnalyzer, UnusedSelectorAnalyzer, StructureAnalyzer
-from reporters import ConsoleReporter, HTMLReporter
-from utils import get_css_files, get_source_files, parse_html_for_css, parse_list_option
+from reporters import ConsoleReporter, HTMLReporter, ReporterContext
+from utils import get_all_files, get_css_files, parse_html_for_css, parse_list_option
 
 console = Console()
 version="1.4.0"
@@ -43,8 +43,8 @@ def cli():
 @click.option('--full', is_flag=True, help='Show all rows in tables (CLI and HTML).')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output.')
 @click.option('--vscode', is_flag=True, help='Open links in VS Code (vscode:// deep links).')
-@click.option('--blacklist', type=str, default='', help='Comma-separated list of filenames (name.ext) or /dir/ rules to exclude.')
-@click.option('--whitelist', type=str, default='', help='Comma-separated list of filenames (name.ext) or /dir/ rules to include exclusively.')
+@click.option('--blacklist', type=str, default='', help='Comma-separated list of filenames (name.ext or globs like *.min.css) or /dir/ rules to exclude.')
+@click.option('--whitelist', type=str, default='', help='Comma-separated list of filenames (name.ext or globs like *.min.css) or /dir/ rules to include exclusively.')
 def duplicates(path, output_html, merge, per_page_merge, page_root, skip, full, verbose, vscode, blacklist, whitelist):
     """Find duplicate selectors, @media rules, and comments."""
     if verbose:
@@ -74,11 +74,12 @@ def duplicates(path, output_html, merge, per_page_merge, page_root, skip, full,
     results = analyzer.analyze(css_files, merge=merge, page_map=page_info, per_page_merge=per_page_merge, skip_unreferenced=skip)
     
     # Report results
-    console_reporter = ConsoleReporter(project_root=Path(path).resolve(), full=full, use_vscode=vscode)
+    context = ReporterContext(project_root=Path(path).resolve())
+    console_reporter = ConsoleReporter(full=full, use_vscode=vscode, context=context)
     console_reporter.report_duplicates(results, merge=merge)
     
     if output_html:
-        html_reporter = HTMLReporter(project_root=Path(path).resolve(), full=full, use_vscode=vscode)
+        html_reporter = HTMLReporter(full=full, use_vscode=vscode, context=context)
         html_reporter.generate_report(results, output_html, analysis_type='duplicates', merge=merge)
         console.print(f"[green]HTML report generated: {output_html}[/green]")
 
@@ -91,8 +92,8 @@ def duplicates(path, output_html, merge, per_page_merge, page_root, skip, full,
 @click.option('--full', is_flag=True, help='Show all rows in tables (CLI and HTML).')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output.')
 @click.option('--vscode', is_flag=True, help='Open links in VS Code (vscode:// deep links).')
-@click.option('--blacklist', type=str, default='', help='Comma-separated list of filenames (name.ext) or /dir/ rules to exclude.')
-@click.option('--whitelist', type=str, default='', help='Comma-separated list of filenames (name.ext) or /dir/ rules to include exclusively.')
+@click.option('--blacklist', type=str, default='', help='Comma-separated list of filenames (name.ext or globs like *.min.css) or /dir/ rules to exclude.')
+@click.option('--whitelist', type=str, default='', help='Comma-separated list of filenames (name.ext or globs like *.min.css) or /dir/ rules to include exclusively.')
 def unused(path, output_html, page_root, skip, full, verbose, vscode, blacklist, whitelist):
     """Find unused CSS selectors by scanning HTML, PHP, and JS files."""
     if verbose:
@@ -101,8 +102,7 @@ def unused(path, output_html, page_root, skip, full, verbose, vscode, blacklist,
     # Get CSS and source files
     wl = parse_list_option(whitelist)
     bl = parse_list_option(blacklist)
-    css_files = get_css_files(path, whitelist=wl, blacklist=bl)
-    source_files = get_source_files(path, whitelist=wl, blacklist=bl)
+    css_files, source_files = get_all_files(path, whitelist=wl, blacklist=bl)
     
     if not css_files:
         console.print("[red]No CSS files found in the specified path.[/red]")
@@ -122,11 +122,12 @@ def unused(path, output_html, page_root, skip, full, verbose, vscode, blacklist,
     results = analyzer.analyze(css_files, source_files, page_map=page_info, skip_unreferenced=skip)
     
     # Report results
-    console_reporter = ConsoleReporter(project_root=Path(path).resolve(), full=full, use_vscode=vscode)
+    context = ReporterContext(project_root=Path(path).resolve())
+    console_reporter = ConsoleReporter(full=full, use_vscode=vscode, context=context)
     console_reporter.report_unused_selectors(results)
     
     if output_html:
-        html_reporter = HTMLReporter(project_root=Path(path).resolve(), full=full, use_vscode=vscode)
+        html_reporter = HTMLReporter(full=full, use_vscode=vscode, context=context)
         html_reporter.generate_report(results, output_html, analysis_type='unused')
         console.print(f"[green]HTML report generated: {output_html}[/green]")
 
@@ -139,8 +140,8 @@ def unused(path, output_html, page_root, skip, full, verbose, vscode, blacklist,
 @click.option('--full', is_flag=True, help='Show all rows in tables (CLI and HTML).')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output.')
 @click.option('--vscode', is_flag=True, help='Open links in VS Code (vscode:// deep links).')
-@click.option('--blacklist', type=str, default='', help='Comma-separated list of filenames (name.ext) or /dir/ rules to exclude.')
-@click.option('--whitelist', type=str, default='', help='Comma-separated list of filenames (name.ext) or /dir/ rules to include exclusively.')
+@click.option('--blacklist', type=str, default='', help='Comma-separated list of filenames (name.ext or globs like *.min.css) or /dir/ rules to exclude.')
+@click.option('--whitelist', type=str, default='', help='Comma-separated list of filenames (name.ext or globs like *.min.css) or /dir/ rules to include exclusively.')
 def structure(path, output_html, page_root, skip, full, verbose, vscode, blacklist, whitelist):
     """Analyze CSS structure for prefixes, comments, and patterns."""
     if verbose:
@@ -167,11 +168,12 @@ def structure(path, output_html, page_root, skip, full, verbose, vscode, blackli
     results = analyzer.analyze(css_files, page_map=page_info, skip_unreferenced=skip)
     
     # Report results
-    console_reporter = ConsoleReporter(project_root=Path(path).resolve(), full=full, use_vscode=vscode)
+    context = ReporterContext(project_root=Path(path).resolve())
+    console_reporter = ConsoleReporter(full=full, use_vscode=vscode, context=context)
     console_reporter.report_structure(results)
     
     if output_html:
-        html_reporter = HTMLReporter(project_root=Path(path).resolve(), full=full, use_vscode=vscode)
+        html_reporter = HTMLReporter(full=full, use_vscode=vscode, context=context)
         html_reporter.generate_report(results, output_html, analysis_type='structure')
         console.print(f"[green]HTML report generated: {output_html}[/green]")
 
@@ -183,8 +185,8 @@ def structure(path, output_html, page_root, skip, full, verbose, vscode, blackli
 @click.option('--full', is_flag=True, help='Show all rows in tables (CLI and HTML).')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output.')
 @click.option('--vscode', is_flag=True, help='Open links in VS Code (vscode:// deep links).')
-@click.option('--blacklist', type=str, default='', help='Comma-separated list of filenames (name.ext) or /dir/ rules to exclude.')
-@click.option('--whitelist', type=str, default='', help='Comma-separated list of filenames (name.ext) or /dir/ rules to include exclusively.')
+@click.option('--blacklist', type=str, default='', help='Comma-separated list of filenames (name.ext or globs like *.min.css) or /dir/ rules to exclude.')
+@click.option('--whitelist', type=str, default='', help='Comma-separated list of filenames (name.ext or globs like *.min.css) or /dir/ rules to include exclusively.')
 def analyze(path, output_html, page_root, full, verbose, vscode, blacklist, whitelist):
     """Run all analyses (duplicates, unused, structure)."""
     if verbose:
@@ -193,8 +195,7 @@ def analyze(path, output_html, page_root, full, verbose, vscode, blacklist, whit
     # Get all files
     wl = parse_list_option(whitelist)
     bl = parse_list_option(blacklist)
-    css_files = get_css_files(path, whitelist=wl, blacklist=bl)
-    source_files = get_source_files(path, whitelist=wl, blacklist=bl)
+    css_files, source_files = get_all_files(path, whitelist=wl, blacklist=bl)
     
     if not css_files:
         console.print("[red]No CSS files found in the specified path.[/red]")
@@ -225,11 +226,12 @@ def analyze(path, output_html, page_root, full, verbose, vscode, blacklist, whit
     all_results['structure'] = structure_analyzer.analyze(css_files, page_map=page_info)
     
     # Report results
-    console_reporter = ConsoleReporter(project_root=Path(path).resolve(), full=full, use_vscode=vscode)
+    context = ReporterContext(project_root=Path(path).resolve())
+    console_reporter = ConsoleReporter(full=full, use_vscode=vscode, context=context)
     console_reporter.report_comprehensive(all_results)
     
     if output_html:
-        html_reporter = HTMLReporter(project_root=Path(path).resolve(), full=full, use_vscode=vscode)
+        html_reporter = HTMLReporter(full=full, use_vscode=vscode, context=context)
         html_reporter.generate_comprehensive_report(all_results, output_html)
         console.print(f"[green]Comprehensive HTML report generated: {output_html}[/green]")
 
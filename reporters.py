@@ -2,12 +2,25 @@
 Reporting modules for CSS Analyzer.
 """
 
+import hashlib
+import io
+import os
+import pickle
+import re
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from itertools import islice
+from operator import itemgetter
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from pathlib import Path
-from typing import Dict, List, Any
-from jinja2 import Template
+from rich.text import Text
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Any, Set, Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, TemplateNotFound, select_autoescape
+from markupsafe import Markup, escape
 from utils import (
     make_file_href,
     make_rel_label,
@@ -15,29 +28,213 @@ from utils import (
     make_html_link,
     DEFAULT_TABLE_CAP,
     make_vscode_href,
+    to_abs,
 )
 
 
+def _section_macros():
+    """Return the module of templates/section_macros.html (compiled once)."""
+    return _JINJA_ENV.get_template("section_macros.html").module
+
+
+class _MinifyingLoader(FileSystemLoader):
+    """FileSystemLoader that minifies template markup as it is loaded."""
+
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+        return _minify_html(source), filename, uptodate
+
+
+# Shared environment for page templates and section macros. Templates are
+# compiled once per process and their bytecode is cached on disk across runs.
+# Values are autoescaped by MarkupSafe; pre-rendered fragments are passed as Markup.
+_JINJA_ENV = Environment(
+    autoescape=select_autoescape(["html"]),
+    loader=_MinifyingLoader(str(Path(__file__).parent / "templates")),
+    # Cached bytecode is keyed by template source only; the pattern is versioned
+    # so that changing compile options (e.g. autoescape) can't reuse stale code.
+    bytecode_cache=FileSystemBytecodeCache(pattern="__css_analyser_ae_%s.cache"),
+    auto_reload=False,
+    cache_size=-1,
+)
+
+# Duplicate tables rendered via the occurrence_table macro: (results key, title, header, noun)
+_OCCURRENCE_TABLES = (
+    ("selectors", "Duplicate Selectors", "Selector", "selectors"),
+    ("media_queries", "Duplicate Media Queries", "Media Query", "media queries"),
+    ("comments", "Duplicate Comments", "Comment", "comments"),
+)
+
+
+@lru_cache(maxsize=65536)
+def _escape(text: str) -> str:
+    """HTML-escape report text. Selectors, pages and comments repeat across
+    tables and sections, so each distinct string is escaped once."""
+    return str(escape(text))
+
+
+def _count(results: Dict[str, Any], key: str) -> int:
+    """Return the analyzer's precomputed "<key>_count", or len() of the collection."""
+    count = results.get(f"{key}_count")
+    if count is None:
+        count = len(results.get(key) or ())
+    return count
+
+
+def _ranked_prefixes(results: Dict[str, Any]) -> List[Tuple[str, int]]:
+    """Return prefixes with count >= 2, most frequent first.
+
+    Uses the analyzer's precomputed "prefixes_ranked" when present.
+    """
+    ranked = results.get("prefixes_ranked")
+    if ranked is None:
+        candidates = ((k, v) for k, v in results.get("prefixes", {}).items() if v >= 2)
+        ranked = sorted(candidates, key=itemgetter(1), reverse=True)
+    return ranked
+
+
+# (file, line) pair of an analyzer location dict
+_file_line = itemgetter("file", "line")
+
+@lru_cache(maxsize=8192)
+def _loc_str(file: str, line: Any) -> str:
+    """Return the "file:line" form of a location, shared by both reporters."""
+    return f"{file}:{line}"
+
+
+# Badge classes for conflict/override warning types
+_BADGE_CLASS = {
+    "important-blocks-normal": "badge badge-danger",
+    "important-vs-important": "badge badge-warning",
+    "later-overrides-earlier": "badge badge-info",
+    "ambiguous-load-order": "badge badge-warning",
+    "dynamic-css": "badge badge-info",
+}
+_DEFAULT_BADGE = "badge"
+
+# %-format row templates for the HTML tables (measured faster than str.format_map)
+_WARNING_ROW = (
+    "<tr><td>%s</td><td>%s</td><td>%s</td><td>%s</td><td>%s</td>"
+    "<td><span class='%s'>%s</span></td></tr>"
+)
+_LOAD_ORDER_ROW = "<tr><td>%d</td><td>%s</td></tr>"
+_FILE_ROW = "<tr><td>%s</td></tr>"
+_UNUSED_ROW = "<tr><td>%s</td><td>%s</td><td>%s</td></tr>"
+_PREFIX_ROW = "<tr><td><code>%s</code></td><td>%d</td><td>%s</td></tr>"
+_COMMENT_ROW = "<tr><td>%s</td><td>%s</td><td><code>%s</code></td></tr>"
+
+
+def _minify_html(src: str) -> str:
+    """Drop indentation and blank lines from template markup.
+
+    Every whitespace run containing a newline collapses to a single newline, so
+    rendering is unchanged (no <pre>/<script> in the page templates). Applied
+    once when a template is loaded, not per render.
+    """
+    return re.sub(r"\s*\n\s*", "\n", src).strip()
+
+
+# Relative report paths are placed under this directory
+_REPORTS_DIR = PurePosixPath("reports")
+
+# Buffer size for report files; streamed template chunks are small
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Rendered HTML sections keyed by a digest of (section, reporter settings, cwd,
+# results), least recently used first. Only small inputs are cached: a CLI run
+# renders each section once, so the digest is pure overhead there, and it only
+# pays off for library callers that render the same results again in one
+# process (e.g. generate_report followed by generate_comprehensive_report).
+_RENDER_CACHE: "OrderedDict[bytes, str]" = OrderedDict()
+_RENDER_CACHE_SIZE = 32
+_RENDER_CACHE_MAX_ITEMS = 500
+_RENDER_CACHE_LOCK = threading.Lock()
+
+
+def _section_size(results: Dict[str, Any]) -> int:
+    """Number of entries in the top-level collections of a results section."""
+    return sum(len(v) for v in results.values() if isinstance(v, (dict, list, tuple, set)))
+
+
+class ReporterContext:
+    """Shared state for reporters rendering the same analysis run.
+
+    Holds the resolved project root and memo tables for path resolution,
+    relative labels and rendered links, so that several reporters (console and
+    HTML, or the sections of a comprehensive report) reuse the work done for
+    file paths that repeat across tables.
+    """
+
+    def __init__(self, project_root: Path = None):
+        self.project_root = Path(project_root).resolve() if project_root else None
+        self.path_cache: Dict[str, Path] = {}
+        self.label_cache: Dict[Path, str] = {}
+        self.link_cache: Dict[Tuple[str, bool, str], str] = {}
+
+    def resolve(self, path_str: str) -> Path:
+        """Absolutize a path string once (lexically) and reuse the result."""
+        p = self.path_cache.get(path_str)
+        if p is None:
+            p = to_abs(path_str)
+            self.path_cache[path_str] = p
+        return p
+
+    def label(self, p: Path) -> str:
+        """Return the project-relative label for a resolved path."""
+        label = self.label_cache.get(p)
+        if label is None:
+            label = make_rel_label(p, self.project_root or p.parent)
+            self.label_cache[p] = label
+        return label
+
+
+def _buffered(method):
+    """Buffer a ConsoleReporter method's Rich output and flush it once at the end."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.console:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _occurrence_table(title: str, label: str) -> Table:
+    """Build the name/count/locations table used for each duplicate group."""
+    table = Table(title=title)
+    table.add_column(label, style="cyan")
+    table.add_column("Count", style="magenta")
+    table.add_column("Locations", style="yellow")
+    return table
+
+
 class ConsoleReporter:
     """Handles console reporting using rich library."""
 
-    def __init__(self, project_root: Path = None, full: bool = False, use_vscode: bool = False):
+    def __init__(self, project_root: Path = None, full: bool = False, use_vscode: bool = False, context: ReporterContext = None):
         self.console = Console()
-        self.project_root = Path(project_root).resolve() if project_root else None
+        self.context = context if context is not None else ReporterContext(project_root)
+        self.project_root = self.context.project_root
         self.full = full
         self.table_cap = None if full else DEFAULT_TABLE_CAP
         self.use_vscode = use_vscode
 
     def _link_cell(self, path_str: str) -> str:
         """Render a rich-styled clickable link for a file path."""
+        key = ("console", self.use_vscode, path_str)
+        cached = self.context.link_cache.get(key)
+        if cached is not None:
+            return cached
         try:
-            p = Path(path_str).resolve()
+            p = self.context.resolve(path_str)
         except Exception:
             return path_str
-        label = make_rel_label(p, self.project_root or p.parent)
+        label = self.context.label(p)
         href = make_vscode_href(p) if self.use_vscode else make_file_href(p)
         text, style = make_console_link_text(label, href)
-        return f"[{style}]{text}[/]"
+        cell = f"[{style}]{text}[/]"
+        self.context.link_cache[key] = cell
+        return cell
 
     def _format_file_line(self, value: str) -> str:
         """Convert a 'file:line' string into a linkified version preserving the line number.
@@ -55,79 +252,98 @@ class ConsoleReporter:
         if not maybe_line.isdigit():
             return self._link_cell(value)
 
+        key = ("console-line", self.use_vscode, value)
+        cached = self.context.link_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            p = Path(file_part).resolve()
+            p = self.context.resolve(file_part)
         except Exception:
             return value
 
         # Label like \relative\path.css:123
-        label = make_rel_label(p, self.project_root or p.parent) + f":{maybe_line}"
+        label = self.context.label(p) + f":{maybe_line}"
 
         # If VS Code deep links are enabled, make a vscode:// link to jump to the line.
         # Otherwise, keep a normal file link and show the line as text.
         if self.use_vscode:
             href = make_vscode_href(p, int(maybe_line))
             text, style = make_console_link_text(label, href)
-            return f"[{style}]{text}[/]"
+            cell = f"[{style}]{text}[/]"
         else:
-            return f"{self._link_cell(str(p))}:{maybe_line}"
+            cell = f"{self._link_cell(str(p))}:{maybe_line}"
+        self.context.link_cache[key] = cell
+        return cell
 
     def _maybe_cap(self, seq: List[Any]) -> List[Any]:
         if self.full or self.table_cap is None:
             return seq
         return seq[: self.table_cap]
 
+    def _cap_items(self, mapping: Dict[Any, Any]) -> Tuple[List[Any], int]:
+        """Return the (possibly capped) items of a mapping and its total size.
+
+        Only the shown items are materialized; the total comes from len().
+        """
+        if self.full or self.table_cap is None:
+            return list(mapping.items()), len(mapping)
+        return list(islice(mapping.items(), self.table_cap)), len(mapping)
+
+    def _print_load_order(self, load_order: Dict[str, List[str]]):
+        """Print one table per page with its CSS load order chain."""
+        self.console.print("\n[bold blue]Load Order (per page):[/bold blue]")
+        if any(load_order.values()):
+            for page, chain in load_order.items():
+                if not chain:
+                    continue
+                table = Table(title=str(page))
+                table.add_column("Index", justify="right", no_wrap=True)
+                table.add_column("CSS File", overflow="fold")
+                show_chain = chain if self.full else chain[: (self.table_cap or DEFAULT_TABLE_CAP)]
+                add_row = table.add_row
+                for index, cell in zip(map(str, range(1, len(show_chain) + 1)), map(self._link_cell, show_chain)):
+                    add_row(index, cell)
+                if not self.full and len(chain) > len(show_chain):
+                    table.add_row("…", f"(+{len(chain) - len(show_chain)} more)")
+                self.console.print(table)
+        else:
+            self.console.print("[yellow]No load order detected.[/yellow]")
+
+    def _locations_cell(self, locations: List[Dict[str, Any]]) -> str:
+        """Render a list of {'file','line'} locations as newline-separated links."""
+        if self.use_vscode:
+            fmt = self._format_file_line
+            return "\n".join([fmt(_loc_str(f, ln)) for f, ln in map(_file_line, locations)])
+        link_cell = self._link_cell
+        return "\n".join([f"{link_cell(f)}:{ln}" for f, ln in map(_file_line, locations)])
+
+    @_buffered
     def report_duplicates(self, results: Dict[str, Any], merge: bool = False):
         """Report duplicate analysis results."""
         self.console.print(Panel.fit("[bold blue]Duplicate CSS Analysis Report[/bold blue]"))
 
         # Load order per page
         if "load_order" in results:
-            load_order = results.get("load_order") or {}
-            self.console.print("\n[bold blue]Load Order (per page):[/bold blue]")
-            if any(load_order.values()):
-                for page, chain in load_order.items():
-                    if not chain:
-                        continue
-                    table = Table(title=str(page))
-                    table.add_column("Index", justify="right")
-                    table.add_column("CSS File", overflow="fold")
-                    show_chain = chain if self.full else chain[: (self.table_cap or DEFAULT_TABLE_CAP)]
-                    for idx, item in enumerate(show_chain):
-                        table.add_row(str(idx + 1), self._link_cell(item))
-                    if not self.full and len(chain) > len(show_chain):
-                        table.add_row("…", f"(+{len(chain) - len(show_chain)} more)")
-                    self.console.print(table)
-            else:
-                self.console.print("[yellow]No load order detected.[/yellow]")
+            self._print_load_order(results.get("load_order") or {})
 
         # Duplicate selectors
         selectors = results.get("selectors", {})
         if selectors:
             self.console.print("\n[bold red]Duplicate Selectors:[/bold red]")
-            selector_table = Table(title="Duplicate CSS Selectors")
-            selector_table.add_column("Selector", style="cyan")
-            selector_table.add_column("Count", style="magenta")
-            selector_table.add_column("Locations", style="yellow")
-
-            items = list(selectors.items())
-            shown = self._maybe_cap(items)
-            for selector, locations in shown:
-                count = len(locations)
-                if self.use_vscode:
-                    locations_str = "\n".join(
-                        [self._format_file_line(f"{loc['file']}:{loc['line']}") for loc in locations]
-                    )
-                else:
-                    locations_str = "\n".join(
-                        [f"{self._link_cell(loc['file'])}:{loc['line']}" for loc in locations]
-                    )
-                selector_table.add_row(selector, str(count), locations_str)
+            selector_table = _occurrence_table("Duplicate CSS Selectors", "Selector")
+
+            shown, total = self._cap_items(selectors)
+            locations_cell = self._locations_cell
+            rows = [(selector, str(len(locations)), locations_cell(locations)) for selector, locations in shown]
+            add_row = selector_table.add_row
+            for row in rows:
+                add_row(*row)
 
             self.console.print(selector_table)
-            if not self.full and len(items) > len(shown):
+            if not self.full and total > len(shown):
                 self.console.print(
-                    f"[yellow]Showing {len(shown)} of {len(items)} selectors. Use --full to show all.[/yellow]"
+                    f"[yellow]Showing {len(shown)} of {total} selectors. Use --full to show all.[/yellow]"
                 )
         else:
             self.console.print("[green]✓ No duplicate selectors found.[/green]")
@@ -136,29 +352,19 @@ class ConsoleReporter:
         media = results.get("media_queries", {})
         if media:
             self.console.print("\n[bold red]Duplicate Media Queries:[/bold red]")
-            media_table = Table(title="Duplicate Media Queries")
-            media_table.add_column("Media Query", style="cyan")
-            media_table.add_column("Count", style="magenta")
-            media_table.add_column("Locations", style="yellow")
-
-            items = list(media.items())
-            shown = self._maybe_cap(items)
-            for mq, locations in shown:
-                count = len(locations)
-                if self.use_vscode:
-                    locations_str = "\n".join(
-                        [self._format_file_line(f"{loc['file']}:{loc['line']}") for loc in locations]
-                    )
-                else:
-                    locations_str = "\n".join(
-                        [f"{self._link_cell(loc['file'])}:{loc['line']}" for loc in locations]
-                    )
-                media_table.add_row(mq, str(count), locations_str)
+            media_table = _occurrence_table("Duplicate Media Queries", "Media Query")
+
+            shown, total = self._cap_items(media)
+            locations_cell = self._locations_cell
+            rows = [(mq, str(len(locations)), locations_cell(locations)) for mq, locations in shown]
+            add_row = media_table.add_row
+            for row in rows:
+                add_row(*row)
 
             self.console.print(media_table)
-            if not self.full and len(items) > len(shown):
+            if not self.full and total > len(shown):
                 self.console.print(
-                    f"[yellow]Showing {len(shown)} of {len(items)} media queries. Use --full to show all.[/yellow]"
+                    f"[yellow]Showing {len(shown)} of {total} media queries. Use --full to show all.[/yellow]"
                 )
         else:
             self.console.print("[green]✓ No duplicate media queries found.[/green]")
@@ -167,35 +373,26 @@ class ConsoleReporter:
         comments = results.get("comments", {})
         if comments:
             self.console.print("\n[bold red]Duplicate Comments:[/bold red]")
-            comment_table = Table(title="Duplicate Comments")
-            comment_table.add_column("Comment", style="cyan")
-            comment_table.add_column("Count", style="magenta")
-            comment_table.add_column("Locations", style="yellow")
-
-            items = list(comments.items())
-            shown = self._maybe_cap(items)
-            for comment, locations in shown:
-                count = len(locations)
-                if self.use_vscode:
-                    locations_str = "\n".join(
-                        [self._format_file_line(f"{loc['file']}:{loc['line']}") for loc in locations]
-                    )
-                else:
-                    locations_str = "\n".join(
-                        [f"{self._link_cell(loc['file'])}:{loc['line']}" for loc in locations]
-                    )
-                comment_table.add_row(comment, str(count), locations_str)
+            comment_table = _occurrence_table("Duplicate Comments", "Comment")
+
+            shown, total = self._cap_items(comments)
+            locations_cell = self._locations_cell
+            rows = [(comment, str(len(locations)), locations_cell(locations)) for comment, locations in shown]
+            add_row = comment_table.add_row
+            for row in rows:
+                add_row(*row)
 
             self.console.print(comment_table)
-            if not self.full and len(items) > len(shown):
+            if not self.full and total > len(shown):
                 self.console.print(
-                    f"[yellow]Showing {len(shown)} of {len(items)} comments. Use --full to show all.[/yellow]"
+                    f"[yellow]Showing {len(shown)} of {total} comments. Use --full to show all.[/yellow]"
                 )
         else:
             self.console.print("[green]✓ No duplicate comments found.[/green]")
 
         # Conflicts
-        if results.get("warnings"):
+        warns = results.get("warnings")
+        if warns:
             self.console.print("\n[bold yellow]Conflicts & Overrides:[/bold yellow]")
             warn_table = Table(title="Conflicts & Overrides")
             warn_table.add_column("Selector", style="cyan")
@@ -204,17 +401,16 @@ class ConsoleReporter:
             warn_table.add_column("From", style="yellow")
             warn_table.add_column("To", style="yellow")
             warn_table.add_column("Reason", style="white")
-            warns = results["warnings"]
             shown = self._maybe_cap(warns)
+            fmt = self._format_file_line
+            add_row = warn_table.add_row
             for w in shown:
-                from_val = self._format_file_line(w.get("from", ""))
-                to_val = self._format_file_line(w.get("to", ""))
-                warn_table.add_row(
+                add_row(
                     w.get("selector", ""),
                     w.get("property", ""),
                     str(w.get("page", "—")),
-                    from_val,
-                    to_val,
+                    fmt(w.get("from", "")),
+                    fmt(w.get("to", "")),
                     w.get("reason", w.get("type", "")),
                 )
             self.console.print(warn_table)
@@ -224,32 +420,36 @@ class ConsoleReporter:
                 )
 
         # Merged CSS
-        if merge and results.get("merged"):
+        merged = results.get("merged") if merge else None
+        if merged:
             self.console.print("\n[bold green]Merged CSS Rules:[/bold green]")
-            for selector, merged_css in results["merged"].items():
+            for selector, merged_css in merged.items():
                 self.console.print(f"[cyan]{merged_css}[/cyan]")
                 self.console.print()
 
-        if merge and results.get("merged_per_page"):
+        merged_per_page = results.get("merged_per_page") if merge else None
+        if merged_per_page:
             self.console.print("\n[bold green]Merged CSS Rules (Per Page):[/bold green]")
-            for page, selmap in results["merged_per_page"].items():
+            for page, selmap in merged_per_page.items():
                 self.console.print(f"[bold]{page}[/bold]")
                 for selector, merged_css in selmap.items():
                     self.console.print(f"[cyan]{merged_css}[/cyan]")
 
         # Errors
-        if results.get("errors"):
+        errors = results.get("errors")
+        if errors:
             self.console.print("\n[bold red]Errors:[/bold red]")
-            for error in results["errors"]:
+            for error in errors:
                 self.console.print(f"- {error}")
 
+    @_buffered
     def report_unused_selectors(self, results: Dict[str, Any]):
         """Report unused selector analysis results."""
         self.console.print(Panel.fit("[bold blue]Unused Selector Analysis Report[/bold blue]"))
 
         total_selectors = results.get("total_selectors", 0)
-        used_selectors = len(results.get("used_selectors", set()))
-        unused_selectors_count = len(results.get("unused_selectors", {}))
+        used_selectors = _count(results, "used_selectors")
+        unused_selectors_count = _count(results, "unused_selectors")
         usage_percentage = results.get("usage_percentage", 0)
 
         summary_table = Table(title="Summary")
@@ -262,10 +462,11 @@ class ConsoleReporter:
         self.console.print(summary_table)
 
         # Unused CSS files (from page map if available)
-        if results.get("unused_files"):
+        unused_files = results.get("unused_files")
+        if unused_files:
             file_table = Table(title="Unused CSS Files")
             file_table.add_column("File", style="yellow")
-            files = list(results["unused_files"]) or []
+            files = list(unused_files)
             shown = self._maybe_cap(files)
             for f in shown:
                 file_table.add_row(self._link_cell(f))
@@ -287,32 +488,41 @@ class ConsoleReporter:
             unused_table.add_column("Line", style="magenta")
 
             # Flatten entries for possible capping
-            rows: List[Any] = []
-            for selector, locations in unused.items():
-                for loc in locations:
-                    rows.append((selector, loc.get("file", ""), loc.get("line", "")))
-            shown = self._maybe_cap(rows)
+            rows = (
+                (selector, loc.get("file", ""), str(loc.get("line", "")))
+                for selector, locations in unused.items()
+                for loc in locations
+            )
+            total = results.get("unused_occurrences_count")
+            if total is None:
+                total = sum(map(len, unused.values()))
+            shown = list(rows) if self.full else list(islice(rows, self.table_cap))
+            # Selector/line cells are plain text: hand Rich ready-made Text
+            # objects so it skips markup parsing for every row.
+            add_row = unused_table.add_row
             for selector, file_path, line in shown:
                 file_cell = (
-                    self._format_file_line(f"{file_path}:{line}")
-                    if self.use_vscode and str(line).isdigit()
+                    self._format_file_line(_loc_str(file_path, line))
+                    if self.use_vscode and line.isdigit()
                     else self._link_cell(file_path)
                 )
-                unused_table.add_row(selector, file_cell, str(line))
+                add_row(Text(selector), file_cell, Text(line))
             self.console.print(unused_table)
-            if not self.full and len(rows) > len(shown):
+            if not self.full and total > len(shown):
                 self.console.print(
-                    f"[yellow]Showing {len(shown)} of {len(rows)} occurrences. Use --full to show all.[/yellow]"
+                    f"[yellow]Showing {len(shown)} of {total} occurrences. Use --full to show all.[/yellow]"
                 )
         else:
             self.console.print("[green]✓ No unused selectors found.[/green]")
 
         # Errors
-        if results.get("errors"):
+        errors = results.get("errors")
+        if errors:
             self.console.print("\n[bold red]Errors:[/bold red]")
-            for error in results["errors"]:
+            for error in errors:
                 self.console.print(f"- {error}")
 
+    @_buffered
     def report_structure(self, results: Dict[str, Any]):
         """Report structure analysis results."""
         self.console.print(Panel.fit("[bold blue]Structure Analysis Report[/bold blue]"))
@@ -331,37 +541,21 @@ class ConsoleReporter:
 
         # Load order per page (if provided by analyzer)
         if "load_order" in results:
-            load_order = results.get("load_order") or {}
-            self.console.print("\n[bold blue]Load Order (per page):[/bold blue]")
-            if any(load_order.values()):
-                for page, chain in load_order.items():
-                    if not chain:
-                        continue
-                    table = Table(title=str(page))
-                    table.add_column("Index", justify="right")
-                    table.add_column("CSS File", overflow="fold")
-                    show_chain = chain if self.full else chain[: (self.table_cap or DEFAULT_TABLE_CAP)]
-                    for idx, item in enumerate(show_chain):
-                        table.add_row(str(idx + 1), self._link_cell(item))
-                    if not self.full and len(chain) > len(show_chain):
-                        table.add_row("…", f"(+{len(chain) - len(show_chain)} more)")
-                    self.console.print(table)
-            else:
-                self.console.print("[yellow]No load order detected.[/yellow]")
+            self._print_load_order(results.get("load_order") or {})
 
         # Prefix analysis
-        prefixes = results.get("prefixes", {})
-        filtered = [(k, v) for k, v in prefixes.items() if v >= 2]
-        if filtered:
+        ranked = _ranked_prefixes(results)
+        total = len(ranked)
+        if total:
             self.console.print("\n[bold blue]Prefix Analysis (classes and IDs):[/bold blue]")
             prefix_table = Table(title="Prefixes")
             prefix_table.add_column("Prefix", style="cyan")
             prefix_table.add_column("Count", style="magenta")
             prefix_table.add_column("Example Tokens", style="yellow")
-            sorted_prefixes = sorted(filtered, key=lambda x: x[1], reverse=True)
-            shown = sorted_prefixes if self.full else sorted_prefixes[: (self.table_cap or DEFAULT_TABLE_CAP)]
+            shown = ranked if self.full else ranked[: (self.table_cap or DEFAULT_TABLE_CAP)]
+            prefix_groups = results.get("prefix_groups", {})
             for prefix, count in shown:
-                classes = results.get("prefix_groups", {}).get(prefix, [])
+                classes = prefix_groups.get(prefix, [])
                 if self.full:
                     example_classes = ", ".join(classes)
                 else:
@@ -370,9 +564,9 @@ class ConsoleReporter:
                         example_classes += f" (+{len(classes) - 3} more)"
                 prefix_table.add_row(prefix, str(count), example_classes)
             self.console.print(prefix_table)
-            if not self.full and len(sorted_prefixes) > len(shown):
+            if not self.full and total > len(shown):
                 self.console.print(
-                    f"[yellow]Showing {len(shown)} of {len(sorted_prefixes)} prefixes (count ≥ 2). Use --full to show all.[/yellow]"
+                    f"[yellow]Showing {len(shown)} of {total} prefixes (count ≥ 2). Use --full to show all.[/yellow]"
                 )
 
         # Comments
@@ -391,21 +585,14 @@ class ConsoleReporter:
                 if self.full:
                     comment_text = comment.get("text", "")
                 else:
-                    comment_text = (
-                        (comment.get("text", "")[:80] + "...")
-                        if len(comment.get("text", "")) > 80
-                        else comment.get("text", "")
-                    )
+                    comment_text = comment.get("preview", comment.get("text", ""))
+                line = str(comment.get("line", ""))
                 file_cell = (
-                    self._format_file_line(f"{comment.get('file','')}:{comment.get('line','')}")
-                    if self.use_vscode and str(comment.get("line", "")).isdigit()
+                    self._format_file_line(f"{comment.get('file','')}:{line}")
+                    if self.use_vscode and line.isdigit()
                     else self._link_cell(comment.get("file", ""))
                 )
-                comments_table.add_row(
-                    file_cell,
-                    str(comment.get("line", "")),
-                    comment_text,
-                )
+                comments_table.add_row(file_cell, line, comment_text)
             self.console.print(comments_table)
             if not self.full and len(comments_list) > len(shown):
                 self.console.print(
@@ -413,11 +600,13 @@ class ConsoleReporter:
                 )
 
         # Errors
-        if results.get("errors"):
+        errors = results.get("errors")
+        if errors:
             self.console.print("\n[bold red]Errors:[/bold red]")
-            for error in results["errors"]:
+            for error in errors:
                 self.console.print(f"[red]• {error}[/red]")
 
+    @_buffered
     def report_comprehensive(self, all_results: Dict[str, Any]):
         """Report comprehensive analysis results."""
         self.console.print(Panel.fit("[bold blue]Comprehensive CSS Analysis Report[/bold blue]"))
@@ -452,7 +641,7 @@ class ConsoleReporter:
 
     def _report_unused_summary(self, results: Dict[str, Any]):
         """Report a summary of unused selector analysis."""
-        unused_count = len(results.get("unused_selectors", {}))
+        unused_count = _count(results, "unused_selectors")
         usage_percentage = results.get("usage_percentage", 0)
 
         if unused_count > 0:
@@ -476,84 +665,78 @@ class ConsoleReporter:
 class HTMLReporter:
     """Handles HTML report generation."""
 
-    def __init__(self, project_root: Path = None, full: bool = False, use_vscode: bool = False):
+    # Absolute reports/ directories already created in this process
+    _reports_dirs_ready: Set[str] = set()
+
+    # analysis_type -> section builder rendered by generate_report
+    _SECTION_BUILDERS = {
+        "duplicates": "_duplicates_section",
+        "unused": "_unused_section",
+        "structure": "_structure_section",
+    }
+
+    def __init__(self, project_root: Path = None, full: bool = False, use_vscode: bool = False, context: ReporterContext = None):
         self.template = self._load_template()
-        self.project_root = Path(project_root).resolve() if project_root else None
+        self.context = context if context is not None else ReporterContext(project_root)
+        self.project_root = self.context.project_root
         self.full = full
         self.table_cap = None if full else DEFAULT_TABLE_CAP
         self.use_vscode = use_vscode
+        # Rendered "link:line" fragments keyed by (file, line)
+        self._location_cache: Dict[Tuple[str, Any], str] = {}
+        # Joined cells for location lists that repeat across groups and tables
+        self._joined_locations_cache: Dict[Tuple[Tuple[str, Any], ...], str] = {}
+        # Load order tables for chains shared by several pages
+        self._chain_cache: Dict[Tuple[str, ...], str] = {}
+        self._load_order_cache: Dict[Tuple[Any, ...], str] = {}
 
     def _ensure_reports_folder(self):
-        """Ensure the reports folder exists."""
-        reports_dir = Path("reports")
-        reports_dir.mkdir(exist_ok=True)
+        """Ensure the reports folder under the current directory exists.
+
+        Created at most once per directory; a cwd change or a removed folder
+        falls back to mkdir.
+        """
+        reports_dir = os.path.abspath("reports")
+        if reports_dir in HTMLReporter._reports_dirs_ready and os.path.isdir(reports_dir):
+            return
+        Path(reports_dir).mkdir(exist_ok=True)
+        HTMLReporter._reports_dirs_ready.add(reports_dir)
+
+    def _report_path(self, output_path: Path) -> Path:
+        """Prefix output_path with reports/ if it's relative and not already under reports/."""
+        if output_path.is_absolute():
+            return output_path
+        posix = PurePosixPath(str(output_path).replace("\\", "/").lstrip("./"))
+        if posix.is_relative_to(_REPORTS_DIR):
+            return output_path
+        return Path("reports") / output_path
 
     def _load_template(self) -> Template:
         """Load the HTML template."""
-        template_path = Path(__file__).parent / "templates" / "report_template.html"
         try:
-            with open(template_path, "r", encoding="utf-8") as f:
-                return Template(f.read())
-        except FileNotFoundError:
+            return _JINJA_ENV.get_template("report_template.html")
+        except TemplateNotFound:
             # Fallback to basic template
             return self._get_fallback_template()
 
     def _get_fallback_template(self) -> Template:
         """Get a basic fallback template."""
-        return Template(
-            """
-<!DOCTYPE html>
-<html lang=\"en\">
-<head>
-    <meta charset=\"UTF-8\">
-    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">
-    <title>CSS Analysis Report</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }
-        .container { max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-        h1 { color: #333; border-bottom: 2px solid #007bff; padding-bottom: 10px; }
-        h2 { color: #555; margin-top: 30px; }
-        .summary { background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0; }
-        .error { color: #dc3545; background: #f8d7da; padding: 10px; border-radius: 5px; margin: 10px 0; }
-        .success { color: #155724; background: #d4edda; padding: 10px; border-radius: 5px; margin: 10px 0; }
-        table { width: 100%; border-collapse: collapse; margin: 20px 0; }
-        th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
-        th { background-color: #f2f2f2; font-weight: bold; }
-        tr:nth-child(even) { background-color: #f9f9f9; }
-        .code { font-family: monospace; background: #f1f1f1; padding: 2px 4px; border-radius: 3px; }
-        .badge { display: inline-block; padding: 4px 8px; border-radius: 12px; font-size: 12px; font-weight: bold; }
-        .badge-danger { background-color: #dc3545; color: white; }
-        .badge-warning { background-color: #ffc107; color: #212529; }
-        .badge-info { background-color: #17a2b8; color: white; }
-        .badge-success { background-color: #28a745; color: white; }
-        a.file-link { color: #c59f00; text-decoration: underline; }
-    </style>
-</head>
-<body>
-    <div class=\"container\">
-        <h1>CSS Analysis Report</h1>
-        
-        {% if analysis_type == 'duplicates' %}
-            {{ duplicates_section(results, merge) }}
-        {% elif analysis_type == 'unused' %}
-            {{ unused_section(results) }}
-        {% elif analysis_type == 'structure' %}
-            {{ structure_section(results) }}
-        {% endif %}
-    </div>
-</body>
-</html>
-        """
-        )
+        return _compiled_template("fallback")
 
     def _make_link(self, path_str: str) -> str:
+        key = ("html", self.use_vscode, path_str)
+        cached = self.context.link_cache.get(key)
+        if cached is not None:
+            return cached
         try:
-            p = Path(path_str).resolve()
+            p = self.context.resolve(path_str)
         except Exception:
             return path_str
-        label = make_rel_label(p, self.project_root or p.parent)
+        label = self.context.label(p)
         href = make_vscode_href(p) if self.use_vscode else make_file_href(p)
-        return make_html_link(label, href)
+        link = make_html_link(label, href)
+        self.context.link_cache[key] = link
+        return link
 
     def _format_file_line_html(self, value: str) -> str:
         """Format 'file:line' into an HTML link that can jump to the line in VS Code."""
@@ -564,428 +747,530 @@ class HTMLReporter:
         maybe_line = value[idx + 1 :]
         file_part = value[:idx]
 
+        key = ("html-line", self.use_vscode, value)
+        cached = self.context.link_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            p = Path(file_part).resolve()
+            p = self.context.resolve(file_part)
         except Exception:
             return value
 
-        label = make_rel_label(p, self.project_root or p.parent) + (f":{maybe_line}" if maybe_line.isdigit() else "")
+        label = self.context.label(p) + (f":{maybe_line}" if maybe_line.isdigit() else "")
         if self.use_vscode and maybe_line.isdigit():
             href = make_vscode_href(p, int(maybe_line))
-            return make_html_link(label, href)
         else:
             # Fallback to plain file link; preserve visible ":line" text in label
             href = make_file_href(p)
-            return make_html_link(label, href)
+        link = make_html_link(label, href)
+        self.context.link_cache[key] = link
+        return link
 
     def _maybe_cap(self, seq: List[Any]) -> List[Any]:
         if self.full or self.table_cap is None:
             return seq
         return seq[: self.table_cap]
 
+    def _cap_items(self, mapping: Dict[Any, Any]) -> Tuple[List[Any], int]:
+        """Return the (possibly capped) items of a mapping and its total size.
+
+        Only the shown items are materialized; the total comes from len().
+        """
+        if self.full or self.table_cap is None:
+            return list(mapping.items()), len(mapping)
+        return list(islice(mapping.items(), self.table_cap)), len(mapping)
+
+    def _locations_html(self, locations: List[Dict[str, Any]]) -> str:
+        """Render a list of {'file','line'} locations as <br>-separated links.
+
+        Fragments are memoized per (file, line) on the reporter and whole lists
+        by their (file, line) pairs; the location dicts themselves are left
+        untouched.
+        """
+        joined_key = tuple(map(_file_line, locations))
+        joined = self._joined_locations_cache.get(joined_key)
+        if joined is not None:
+            return joined
+        cache = self._location_cache
+        style = self.use_vscode
+        parts: List[str] = []
+        for key in joined_key:
+            fragment = cache.get(key)
+            if fragment is None:
+                if style:
+                    fragment = self._format_file_line_html(_loc_str(*key))
+                else:
+                    fragment = "%s:%s" % (self._make_link(key[0]), key[1])
+                cache[key] = fragment
+            parts.append(fragment)
+        joined = "<br>".join(parts)
+        self._joined_locations_cache[joined_key] = joined
+        return joined
+
+    def _load_order_html(self, load_order: Dict[str, List[str]]) -> str:
+        """Render the "Load Order (per page)" block.
+
+        Cached by page/chain content so the duplicates and structure sections of
+        one report share the output.
+        """
+        key = tuple((page, tuple(chain)) for page, chain in load_order.items() if chain)
+        cached = self._load_order_cache.get(key)
+        if cached is not None:
+            return cached
+        parts = ["<h3>Load Order (per page)</h3>"]
+        if key:
+            # Pages often share an identical chain; only those tables are memoized
+            chain_counts = Counter(chain for _, chain in key)
+            for page, chain in key:
+                parts.append(f"<h4>{_escape(page)}</h4>")
+                parts.append(self._load_order_table(chain, memoize=chain_counts[chain] > 1))
+        else:
+            parts.append('<div class="summary"><em>No load order detected.</em></div>')
+        html = "".join(parts)
+        self._load_order_cache[key] = html
+        return html
+
+    def _load_order_table(self, chain: Tuple[str, ...], memoize: bool = False) -> str:
+        """Render the table for one page's CSS load order chain."""
+        cached = self._chain_cache.get(chain)
+        if cached is not None:
+            return cached
+        show_chain = chain if self.full else chain[: (self.table_cap or DEFAULT_TABLE_CAP)]
+        make_link = self._make_link
+        parts = ["<table>", "<tr><th>#</th><th>CSS File</th></tr>"]
+        parts.extend([_LOAD_ORDER_ROW % (i, make_link(item)) for i, item in enumerate(show_chain, 1)])
+        if not self.full and len(chain) > len(show_chain):
+            parts.append(f"<tr><td>…</td><td>(+{len(chain) - len(show_chain)} more)</td></tr>")
+        parts.append("</table>")
+        table = "".join(parts)
+        if memoize:
+            self._chain_cache[chain] = table
+        return table
+
+    def _render_cached(self, builder, results: Dict[str, Any], *args) -> Markup:
+        """Render a section, reusing earlier output for identical input.
+
+        The cache key is a digest of the pickled section input plus the settings
+        and working directory that affect rendering. Inputs with more than
+        _RENDER_CACHE_MAX_ITEMS top-level entries, or that cannot be pickled,
+        are rendered without caching. The section HTML is returned as Markup so
+        the autoescaping page templates insert it verbatim.
+        """
+        if _section_size(results) > _RENDER_CACHE_MAX_ITEMS:
+            return Markup(builder(results, *args))
+        try:
+            payload = pickle.dumps(
+                (builder.__name__, self.full, self.table_cap, self.use_vscode, self.project_root,
+                 os.getcwd(), args, results)
+            )
+        except Exception:
+            return Markup(builder(results, *args))
+        key = hashlib.blake2b(payload, digest_size=16).digest()
+        with _RENDER_CACHE_LOCK:
+            html = _RENDER_CACHE.get(key)
+            if html is not None:
+                _RENDER_CACHE.move_to_end(key)
+                return Markup(html)
+        html = builder(results, *args)
+        with _RENDER_CACHE_LOCK:
+            _RENDER_CACHE[key] = html
+            if len(_RENDER_CACHE) > _RENDER_CACHE_SIZE:
+                _RENDER_CACHE.popitem(last=False)
+        return Markup(html)
+
     def generate_report(self, results: Dict[str, Any], output_path: Path, analysis_type: str, merge: bool = False):
         """Generate HTML report for a specific analysis type."""
         self._ensure_reports_folder()
+        output_path = self._report_path(output_path)
 
-        # Prefix output_path with reports/ if it's relative and not already under reports/
-        if not output_path.is_absolute():
-            op_str = str(output_path).replace("\\", "/").lstrip("./")
-            if not op_str.startswith("reports/"):
-                output_path = Path("reports") / output_path
-
-        html_content = self.template.render(
-            results=results,
-            analysis_type=analysis_type,
-            merge=merge,
-            duplicates_section=self._duplicates_section,
-            unused_section=self._unused_section,
-            structure_section=self._structure_section,
-        )
+        # Build only the requested section; the page template just places it
+        section_html = ""
+        builder = self._SECTION_BUILDERS.get(analysis_type)
+        if builder is not None:
+            args = (merge,) if analysis_type == "duplicates" else ()
+            section_html = self._render_cached(getattr(self, builder), results, *args)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        # Stream template chunks straight to the file instead of building one string
+        stream = self.template.stream(section_html=section_html)
+        with open(output_path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+            stream.dump(f)
 
     def generate_comprehensive_report(self, all_results: Dict[str, Any], output_path: Path):
         """Generate comprehensive HTML report."""
         self._ensure_reports_folder()
+        output_path = self._report_path(output_path)
 
-        # Prefix output_path with reports/ if it's relative and not already under reports/
-        if not output_path.is_absolute():
-            op_str = str(output_path).replace("\\", "/").lstrip("./")
-            if not op_str.startswith("reports/"):
-                output_path = Path("reports") / output_path
-
-        html_content = self._get_comprehensive_template().render(
-            all_results=all_results,
-            duplicates_section=self._duplicates_section,
-            unused_section=self._unused_section,
-            structure_section=self._structure_section,
+        duplicates_html, unused_html, structure_html = self._render_all_sections(all_results)
+        stream = self._get_comprehensive_template().stream(
+            duplicates_html=duplicates_html,
+            unused_html=unused_html,
+            structure_html=structure_html,
         )
+        with open(output_path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+            stream.dump(f)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+    def _render_all_sections(self, all_results: Dict[str, Any]) -> Tuple[str, str, str]:
+        """Render the duplicates, unused and structure sections of a comprehensive report.
+
+        The load order block shared by the duplicates and structure sections is
+        rendered once up front; the sections then read disjoint parts of
+        all_results and are built concurrently.
+        """
+        duplicates = all_results.get("duplicates", {})
+        structure = all_results.get("structure", {})
+        for section in (duplicates, structure):
+            if "load_order" in section:
+                self._load_order_html(section.get("load_order") or {})
+
+        unused = all_results.get("unused", {})
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            # Sections missing from all_results are skipped and render as ""
+            jobs = [
+                pool.submit(self._render_cached, self._duplicates_section, duplicates, "merged" in duplicates)
+                if duplicates else None,
+                pool.submit(self._render_cached, self._unused_section, unused) if unused else None,
+                pool.submit(self._render_cached, self._structure_section, structure) if structure else None,
+            ]
+            return tuple(job.result() if job is not None else "" for job in jobs)
 
     def _get_comprehensive_template(self) -> Template:
         """Get comprehensive report template."""
-        return Template(
-            """
-<!DOCTYPE html>
-<html lang=\"en\">
-<head>
-    <meta charset=\"UTF-8\">
-    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">
-    <title>Comprehensive CSS Analysis Report</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }
-        .container { max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-        h1 { color: #333; border-bottom: 2px solid #007bff; padding-bottom: 10px; }
-        h2 { color: #555; margin-top: 30px; }
-        h3 { color: #666; margin-top: 25px; }
-        .summary { background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0; }
-        .error { color: #dc3545; background: #f8d7da; padding: 10px; border-radius: 5px; margin: 10px 0; }
-        .success { color: #155724; background: #d4edda; padding: 10px; border-radius: 5px; margin: 10px 0; }
-        table { width: 100%; border-collapse: collapse; margin: 20px 0; }
-        th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
-        th { background-color: #f2f2f2; font-weight: bold; }
-        tr:nth-child(even) { background-color: #f9f9f9; }
-        .code { font-family: monospace; background: #f1f1f1; padding: 2px 4px; border-radius: 3px; }
-        .badge { display: inline-block; padding: 4px 8px; border-radius: 12px; font-size: 12px; font-weight: bold; }
-        .badge-danger { background-color: #dc3545; color: white; }
-        .badge-warning { background-color: #ffc107; color: #212529; }
-        .badge-info { background-color: #17a2b8; color: white; }
-        .badge-success { background-color: #28a745; color: white; }
-        a.file-link { color: #c59f00; text-decoration: underline; }
-        .section { margin: 30px 0; padding: 20px; border: 1px solid #e0e0e0; border-radius: 8px; }
-    </style>
-</head>
-<body>
-    <div class=\"container\">
-        <h1>Comprehensive CSS Analysis Report</h1>
-        
-        <div class=\"section\">
-            <h2>1. Duplicate Analysis</h2>
-            {{ duplicates_section(all_results.get('duplicates', {}), 'merged' in all_results.get('duplicates', {})) }}
-        </div>
-        
-        <div class=\"section\">
-            <h2>2. Unused Selector Analysis</h2>
-            {{ unused_section(all_results.get('unused', {})) }}
-        </div>
-        
-        <div class=\"section\">
-            <h2>3. Structure Analysis</h2>
-            {{ structure_section(all_results.get('structure', {})) }}
-        </div>
-    </div>
-</body>
-</html>
-        """
-        )
+        return _compiled_template("comprehensive")
 
     def _duplicates_section(self, results: Dict[str, Any], merge: bool = False) -> str:
         """Generate HTML for duplicates section."""
-        html: List[str] = []
+        buf = io.StringIO()
+        write = buf.write
 
         if not results or not any(results.get(key) for key in ["selectors", "media_queries", "comments", "warnings", "load_order"]):
-            html.append('<div class="success">✓ No duplicates found.</div>')
-            return "".join(html)
-
-        # Duplicate selectors
-        selectors = results.get("selectors", {})
-        if selectors:
-            html.append("<h3>Duplicate Selectors</h3>")
-            html.append("<table>")
-            html.append("<tr><th>Selector</th><th>Count</th><th>Locations</th></tr>")
-            items = list(selectors.items())
-            shown = self._maybe_cap(items)
-            for selector, locations in shown:
-                count = len(locations)
-                if self.use_vscode:
-                    locs = [self._format_file_line_html(f"{loc['file']}:{loc['line']}") for loc in locations]
-                else:
-                    locs = [f"{self._make_link(loc['file'])}:{loc['line']}" for loc in locations]
-                locations_str = "<br>".join(locs)
-                html.append(f"<tr><td>{selector}</td><td>{count}</td><td>{locations_str}</td></tr>")
-            html.append("</table>")
-            if not self.full and len(items) > len(shown):
-                html.append(
-                    f"<p><em>Showing {len(shown)} of {len(items)} selectors. Use --full to show all.</em></p>"
-                )
-
-        # Duplicate media queries
-        media = results.get("media_queries", {})
-        if media:
-            html.append("<h3>Duplicate Media Queries</h3>")
-            html.append("<table>")
-            html.append("<tr><th>Media Query</th><th>Count</th><th>Locations</th></tr>")
-            items = list(media.items())
-            shown = self._maybe_cap(items)
-            for mq, locations in shown:
-                count = len(locations)
-                if self.use_vscode:
-                    locs = [self._format_file_line_html(f"{loc['file']}:{loc['line']}") for loc in locations]
-                else:
-                    locs = [f"{self._make_link(loc['file'])}:{loc['line']}" for loc in locations]
-                locations_str = "<br>".join(locs)
-                html.append(f"<tr><td>{mq}</td><td>{count}</td><td>{locations_str}</td></tr>")
-            html.append("</table>")
-            if not self.full and len(items) > len(shown):
-                html.append(
-                    f"<p><em>Showing {len(shown)} of {len(items)} media queries. Use --full to show all.</em></p>"
-                )
-
-        # Duplicate comments
-        comments = results.get("comments", {})
-        if comments:
-            html.append("<h3>Duplicate Comments</h3>")
-            html.append("<table>")
-            html.append("<tr><th>Comment</th><th>Count</th><th>Locations</th></tr>")
-            items = list(comments.items())
-            shown = self._maybe_cap(items)
-            for comment, locations in shown:
-                count = len(locations)
-                if self.use_vscode:
-                    locs = [self._format_file_line_html(f"{loc['file']}:{loc['line']}") for loc in locations]
-                else:
-                    locs = [f"{self._make_link(loc['file'])}:{loc['line']}" for loc in locations]
-                locations_str = "<br>".join(locs)
-                html.append(f"<tr><td>{comment}</td><td>{count}</td><td>{locations_str}</td></tr>")
-            html.append("</table>")
-            if not self.full and len(items) > len(shown):
-                html.append(
-                    f"<p><em>Showing {len(shown)} of {len(items)} comments. Use --full to show all.</em></p>"
-                )
+            write('<div class="success">✓ No duplicates found.</div>')
+            return buf.getvalue()
+
+        locations_html = self._locations_html
+        occurrence_table = _section_macros().occurrence_table
+
+        # Duplicate selectors, media queries and comments
+        for key, title, label, noun in _OCCURRENCE_TABLES:
+            groups = results.get(key, {})
+            if not groups:
+                continue
+            shown, total = self._cap_items(groups)
+            # Materialize every location cell before emitting the table
+            loc_html = {name: locations_html(locations) for name, locations in shown}
+            rows = [(name, len(locations), Markup(loc_html[name])) for name, locations in shown]
+            write(occurrence_table(title, label, rows, total, noun, self.full))
 
         # Load order section
         if "load_order" in results:
-            load_order = results.get("load_order") or {}
-            non_empty = {pg: ch for pg, ch in load_order.items() if ch}
-            html.append("<h3>Load Order (per page)</h3>")
-            if non_empty:
-                for page, chain in non_empty.items():
-                    html.append(f"<h4>{page}</h4>")
-                    html.append("<table>")
-                    html.append("<tr><th>#</th><th>CSS File</th></tr>")
-                    show_chain = chain if self.full else chain[: (self.table_cap or DEFAULT_TABLE_CAP)]
-                    for i, item in enumerate(show_chain):
-                        html.append(f"<tr><td>{i+1}</td><td>{self._make_link(item)}</td></tr>")
-                    if not self.full and len(chain) > len(show_chain):
-                        html.append(
-                            f"<tr><td>…</td><td>(+{len(chain) - len(show_chain)} more)</td></tr>"
-                        )
-                    html.append("</table>")
-            else:
-                html.append('<div class="summary"><em>No load order detected.</em></div>')
+            write(self._load_order_html(results.get("load_order") or {}))
 
         # Conflicts & Overrides
-        if results.get("warnings"):
-            html.append("<h3>Conflicts & Overrides</h3>")
-            html.append("<table>")
-            html.append(
+        warns = results.get("warnings")
+        if warns:
+            write("<h3>Conflicts & Overrides</h3>")
+            write("<table>")
+            write(
                 "<tr><th>Selector</th><th>Property</th><th>Page</th><th>From</th><th>To</th><th>Reason</th></tr>"
             )
-            badge_map = {
-                "important-blocks-normal": "badge badge-danger",
-                "important-vs-important": "badge badge-warning",
-                "later-overrides-earlier": "badge badge-info",
-                "ambiguous-load-order": "badge badge-warning",
-                "dynamic-css": "badge badge-info",
-            }
-            warns = results["warnings"]
             shown = self._maybe_cap(warns)
-            for w in shown:
-                reason = w.get("reason", w.get("type", ""))
-                cls = badge_map.get(w.get("type", ""), "badge")
-                fr = self._format_file_line_html(w.get("from", ""))
-                to = self._format_file_line_html(w.get("to", ""))
-                html.append(
-                    f"<tr><td>{w.get('selector','')}</td><td>{w.get('property','')}</td><td>{w.get('page','')}</td><td>{fr}</td><td>{to}</td><td><span class='{cls}'>{reason}</span></td></tr>"
+            fmt = self._format_file_line_html
+            # Resolve every cell first, then format all rows in one join
+            cells = [
+                (
+                    _escape(w.get("selector", "")),
+                    _escape(w.get("property", "")),
+                    _escape(str(w.get("page", ""))),
+                    fmt(w.get("from", "")),
+                    fmt(w.get("to", "")),
+                    _BADGE_CLASS.get(w.get("type", ""), _DEFAULT_BADGE),
+                    _escape(str(w.get("reason", w.get("type", "")))),
                 )
-            html.append("</table>")
+                for w in shown
+            ]
+            write("".join([_WARNING_ROW % row for row in cells]))
+            write("</table>")
             if not self.full and len(warns) > len(shown):
-                html.append(
+                write(
                     f"<p><em>Showing {len(shown)} of {len(warns)} warnings. Use --full to show all.</em></p>"
                 )
-            html.append(
+            write(
                 '<p><small>Legend: <span class="badge badge-danger">important blocks normal</span> <span class="badge badge-warning">important vs important</span> <span class="badge badge-info">later overrides earlier</span></small></p>'
             )
 
         # Merged CSS
-        if merge and results.get("merged"):
-            html.append("<h3>Merged CSS Rules</h3><br>")
-            for selector, merged_css in results["merged"].items():
-                html.append(f"<pre><code>{merged_css}</code></pre><br>")
-        if merge and results.get("merged_per_page"):
-            html.append("<h3>Merged CSS Rules (Per Page)</h3>")
-            for page, selmap in results["merged_per_page"].items():
-                html.append(f"<h4>{page}</h4>")
+        merged = results.get("merged") if merge else None
+        if merged:
+            write("<h3>Merged CSS Rules</h3><br>")
+            for selector, merged_css in merged.items():
+                write(f"<pre><code>{_escape(merged_css)}</code></pre><br>")
+        merged_per_page = results.get("merged_per_page") if merge else None
+        if merged_per_page:
+            write("<h3>Merged CSS Rules (Per Page)</h3>")
+            for page, selmap in merged_per_page.items():
+                write(f"<h4>{_escape(page)}</h4>")
                 for selector, merged_css in selmap.items():
-                    html.append(f"<pre><code>{merged_css}</code></pre>")
+                    write(f"<pre><code>{_escape(merged_css)}</code></pre>")
 
-        return "".join(html)
+        return buf.getvalue()
 
     def _unused_section(self, results: Dict[str, Any]) -> str:
         """Generate HTML for unused selectors section."""
-        html: List[str] = []
+        buf = io.StringIO()
+        write = buf.write
 
         if not results:
-            html.append('<div class="error">No data available.</div>')
-            return "".join(html)
+            write('<div class="error">No data available.</div>')
+            return buf.getvalue()
 
         # Summary
-        html.append('<div class="summary">')
-        html.append('<h3>Summary</h3>')
-        html.append('<table>')
-        html.append('<tr><th>Metric</th><th>Count</th></tr>')
-        html.append(f'<tr><td>Total Selectors</td><td>{results.get("total_selectors", 0)}</td></tr>')
-        html.append(f'<tr><td>Used Selectors</td><td>{len(results.get("used_selectors", set()))}</td></tr>')
-        html.append(f'<tr><td>Unused Selectors</td><td>{len(results.get("unused_selectors", {}))}</td></tr>')
-        html.append(f'<tr><td>Usage Percentage</td><td>{results.get("usage_percentage", 0):.1f}%</td></tr>')
-        html.append('</table>')
-        html.append('</div>')
+        write(_section_macros().summary_table([
+            ("Total Selectors", results.get("total_selectors", 0)),
+            ("Used Selectors", _count(results, "used_selectors")),
+            ("Unused Selectors", _count(results, "unused_selectors")),
+            ("Usage Percentage", f'{results.get("usage_percentage", 0):.1f}%'),
+        ]))
 
         # Unused CSS files
-        if results.get("unused_files"):
-            html.append("<h3>Unused CSS Files</h3>")
-            html.append("<table>")
-            html.append("<tr><th>File</th></tr>")
-            files = list(results["unused_files"]) or []
+        unused_files = results.get("unused_files")
+        if unused_files:
+            write("<h3>Unused CSS Files</h3>")
+            write("<table>")
+            write("<tr><th>File</th></tr>")
+            files = list(unused_files)
             shown = self._maybe_cap(files)
-            for f in shown:
-                html.append(f"<tr><td>{self._make_link(f)}</td></tr>")
-            html.append("</table>")
+            make_link = self._make_link
+            write("".join([_FILE_ROW % make_link(f) for f in shown]))
+            write("</table>")
             if not self.full and len(files) > len(shown):
-                html.append(
+                write(
                     f"<p><em>Showing {len(shown)} of {len(files)} files. Use --full to show all.</em></p>"
                 )
 
         # Unused selectors
         unused = results.get("unused_selectors", {})
         if unused:
-            html.append("<h3>Unused Selectors</h3>")
-            html.append("<table>")
-            html.append("<tr><th>Selector</th><th>File</th><th>Line</th></tr>")
-
-            rows: List[Any] = []
-            for selector, locations in unused.items():
-                for location in locations:
-                    rows.append((selector, location.get("file", ""), location.get("line", "")))
-            shown = self._maybe_cap(rows)
-            for selector, file_path, line in shown:
-                file_cell = (
-                    self._format_file_line_html(f"{file_path}:{line}")
-                    if self.use_vscode and str(line).isdigit()
-                    else self._make_link(file_path)
-                )
-                html.append(
-                    f"<tr><td>{selector}</td><td>{file_cell}</td><td>{line}</td></tr>"
-                )
-            html.append("</table>")
-            if not self.full and len(rows) > len(shown):
-                html.append(
-                    f"<p><em>Showing {len(shown)} of {len(rows)} occurrences. Use --full to show all.</em></p>"
+            write("<h3>Unused Selectors</h3>")
+            write("<table>")
+            write("<tr><th>Selector</th><th>File</th><th>Line</th></tr>")
+
+            rows = (
+                (selector, location.get("file", ""), str(location.get("line", "")))
+                for selector, locations in unused.items()
+                for location in locations
+            )
+            total = results.get("unused_occurrences_count")
+            if total is None:
+                total = sum(map(len, unused.values()))
+            shown = list(rows) if self.full else list(islice(rows, self.table_cap))
+
+            # Pick the file cell renderer once for the whole table
+            fmt = self._format_file_line_html
+            make_link = self._make_link
+            if self.use_vscode:
+                def file_cell(file_path: str, line: str) -> str:
+                    return fmt(_loc_str(file_path, line)) if line.isdigit() else make_link(file_path)
+            else:
+                def file_cell(file_path: str, line: str) -> str:
+                    return make_link(file_path)
+
+            write("".join([
+                _UNUSED_ROW % (_escape(selector), file_cell(file_path, line), line)
+                for selector, file_path, line in shown
+            ]))
+            write("</table>")
+            if not self.full and total > len(shown):
+                write(
+                    f"<p><em>Showing {len(shown)} of {total} occurrences. Use --full to show all.</em></p>"
                 )
         else:
-            html.append('<div class="success">✓ No unused selectors found.</div>')
+            write('<div class="success">✓ No unused selectors found.</div>')
 
-        return "".join(html)
+        return buf.getvalue()
 
     def _structure_section(self, results: Dict[str, Any]) -> str:
         """Generate HTML for structure section."""
-        html: List[str] = []
+        buf = io.StringIO()
+        write = buf.write
 
         if not results:
-            html.append('<div class="error">No analysis results available.</div>')
-            return "".join(html)
+            write('<div class="error">No analysis results available.</div>')
+            return buf.getvalue()
 
         # Summary
-        html.append('<div class="summary">')
-        html.append('<h3>Summary</h3>')
-        html.append('<table>')
-        html.append('<tr><th>Metric</th><th>Count</th></tr>')
-        html.append(f'<tr><td>Total CSS Rules</td><td>{results.get("total_rules", 0)}</td></tr>')
-        html.append(f'<tr><td>Total Comments</td><td>{results.get("total_comments", 0)}</td></tr>')
-        html.append(f'<tr><td>Unique Prefixes</td><td>{len(results.get("prefixes", {}))}</td></tr>')
-        html.append('</table>')
-        html.append('</div>')
+        write(_section_macros().summary_table([
+            ("Total CSS Rules", results.get("total_rules", 0)),
+            ("Total Comments", results.get("total_comments", 0)),
+            ("Unique Prefixes", len(results.get("prefixes", {}))),
+        ]))
 
         # Load order per page
         if "load_order" in results:
-            load_order = results.get("load_order") or {}
-            non_empty = {pg: ch for pg, ch in load_order.items() if ch}
-            html.append("<h3>Load Order (per page)</h3>")
-            if non_empty:
-                for page, chain in non_empty.items():
-                    html.append(f"<h4>{page}</h4>")
-                    html.append("<table>")
-                    html.append("<tr><th>#</th><th>CSS File</th></tr>")
-                    show_chain = chain if self.full else chain[: (self.table_cap or DEFAULT_TABLE_CAP)]
-                    for i, item in enumerate(show_chain):
-                        html.append(f"<tr><td>{i+1}</td><td>{self._make_link(item)}</td></tr>")
-                    if not self.full and len(chain) > len(show_chain):
-                        html.append(
-                            f"<tr><td>…</td><td>(+{len(chain) - len(show_chain)} more)</td></tr>"
-                        )
-                    html.append("</table>")
-            else:
-                html.append('<div class="summary"><em>No load order detected.</em></div>')
+            write(self._load_order_html(results.get("load_order") or {}))
 
         # Prefix analysis
         prefixes = results.get("prefixes", {})
         if prefixes:
-            filtered = [(k, v) for k, v in prefixes.items() if v >= 2]
-            if filtered:
-                html.append("<h3>Prefix Analysis (classes and IDs)</h3>")
-                html.append("<table>")
-                html.append("<tr><th>Prefix</th><th>Count</th><th>Example Tokens</th></tr>")
-
-                sorted_prefixes = sorted(filtered, key=lambda x: x[1], reverse=True)
-                shown = sorted_prefixes if self.full else sorted_prefixes[: (self.table_cap or DEFAULT_TABLE_CAP)]
+            ranked = _ranked_prefixes(results)
+            total = len(ranked)
+            if total:
+                write("<h3>Prefix Analysis (classes and IDs)</h3>")
+                write("<table>")
+                write("<tr><th>Prefix</th><th>Count</th><th>Example Tokens</th></tr>")
+
+                shown = ranked if self.full else ranked[: (self.table_cap or DEFAULT_TABLE_CAP)]
+                prefix_groups = results.get("prefix_groups", {})
                 for prefix, count in shown:
-                    classes = results.get("prefix_groups", {}).get(prefix, [])
+                    classes = prefix_groups.get(prefix, [])
                     if self.full:
-                        example_classes = ", ".join(classes)
+                        example_classes = ", ".join(map(_escape, classes))
                     else:
-                        example_classes = ", ".join(classes[:3])
+                        example_classes = ", ".join(map(_escape, classes[:3]))
                         if len(classes) > 3:
                             example_classes += f" (+{len(classes) - 3} more)"
-                    html.append(
-                        f"<tr><td><code>{prefix}</code></td><td>{count}</td><td>{example_classes}</td></tr>"
-                    )
+                    write(_PREFIX_ROW % (_escape(prefix), count, example_classes))
 
-                html.append("</table>")
-                if not self.full and len(sorted_prefixes) > len(shown):
-                    html.append(
-                        f"<p><em>Showing {len(shown)} of {len(sorted_prefixes)} prefixes (count ≥ 2). Use --full to show all.</em></p>"
+                write("</table>")
+                if not self.full and total > len(shown):
+                    write(
+                        f"<p><em>Showing {len(shown)} of {total} prefixes (count ≥ 2). Use --full to show all.</em></p>"
                     )
 
         # Comments
         comments = results.get("comments", [])
         if comments:
-            html.append(f"<h3>CSS Comments ({len(comments)})</h3>")
-            html.append("<table>")
-            html.append("<tr><th>File</th><th>Line</th><th>Comment</th></tr>")
+            write(f"<h3>CSS Comments ({len(comments)})</h3>")
+            write("<table>")
+            write("<tr><th>File</th><th>Line</th><th>Comment</th></tr>")
 
             shown = self._maybe_cap(comments)
+            full = self.full
+            use_vscode = self.use_vscode
+            fmt = self._format_file_line_html
+            make_link = self._make_link
             for comment in shown:
-                text = comment.get("text", "")
-                if self.full:
-                    comment_text = text
-                else:
-                    comment_text = text[:80] + "..." if len(text) > 80 else text
+                text = comment.get("text", "") if full else comment.get("preview", comment.get("text", ""))
+                file_path = comment.get("file", "")
+                line = str(comment.get("line", ""))
                 file_cell = (
-                    self._format_file_line_html(f"{comment.get('file','')}:{comment.get('line','')}")
-                    if self.use_vscode and str(comment.get('line','')).isdigit()
-                    else self._make_link(comment.get('file',''))
-                )
-                html.append(
-                    f"<tr><td>{file_cell}</td><td>{comment.get('line','')}</td><td><code>{comment_text}</code></td></tr>"
+                    fmt(_loc_str(file_path, line)) if use_vscode and line.isdigit() else make_link(file_path)
                 )
+                write(_COMMENT_ROW % (file_cell, line, _escape(text)))
 
-            html.append("</table>")
+            write("</table>")
             if not self.full and len(comments) > len(shown):
-                html.append(
+                write(
                     f"<p><em>Showing {len(shown)} of {len(comments)} comments. Use --full to show all.</em></p>"
                 )
 
-        return "".join(html)
\ No newline at end of file
+        return buf.getvalue()
+
+
+# Inline page templates (minified once at import)
+_FALLBACK_TEMPLATE_SRC = _minify_html(
+    """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>CSS Analysis Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }
+        .container { max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        h1 { color: #333; border-bottom: 2px solid #007bff; padding-bottom: 10px; }
+        h2 { color: #555; margin-top: 30px; }
+        .summary { background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0; }
+        .error { color: #dc3545; background: #f8d7da; padding: 10px; border-radius: 5px; margin: 10px 0; }
+        .success { color: #155724; background: #d4edda; padding: 10px; border-radius: 5px; margin: 10px 0; }
+        table { width: 100%; border-collapse: collapse; margin: 20px 0; }
+        th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
+        th { background-color: #f2f2f2; font-weight: bold; }
+        tr:nth-child(even) { background-color: #f9f9f9; }
+        .code { font-family: monospace; background: #f1f1f1; padding: 2px 4px; border-radius: 3px; }
+        .badge { display: inline-block; padding: 4px 8px; border-radius: 12px; font-size: 12px; font-weight: bold; }
+        .badge-danger { background-color: #dc3545; color: white; }
+        .badge-warning { background-color: #ffc107; color: #212529; }
+        .badge-info { background-color: #17a2b8; color: white; }
+        .badge-success { background-color: #28a745; color: white; }
+        a.file-link { color: #c59f00; text-decoration: underline; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>CSS Analysis Report</h1>
+        
+        {{ section_html }}
+    </div>
+</body>
+</html>
+"""
+)
+
+_COMPREHENSIVE_TEMPLATE_SRC = _minify_html(
+    """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Comprehensive CSS Analysis Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }
+        .container { max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        h1 { color: #333; border-bottom: 2px solid #007bff; padding-bottom: 10px; }
+        h2 { color: #555; margin-top: 30px; }
+        h3 { color: #666; margin-top: 25px; }
+        .summary { background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0; }
+        .error { color: #dc3545; background: #f8d7da; padding: 10px; border-radius: 5px; margin: 10px 0; }
+        .success { color: #155724; background: #d4edda; padding: 10px; border-radius: 5px; margin: 10px 0; }
+        table { width: 100%; border-collapse: collapse; margin: 20px 0; }
+        th, td { border: 1px solid #ddd; padding: 12px; text-align: left; }
+        th { background-color: #f2f2f2; font-weight: bold; }
+        tr:nth-child(even) { background-color: #f9f9f9; }
+        .code { font-family: monospace; background: #f1f1f1; padding: 2px 4px; border-radius: 3px; }
+        .badge { display: inline-block; padding: 4px 8px; border-radius: 12px; font-size: 12px; font-weight: bold; }
+        .badge-danger { background-color: #dc3545; color: white; }
+        .badge-warning { background-color: #ffc107; color: #212529; }
+        .badge-info { background-color: #17a2b8; color: white; }
+        .badge-success { background-color: #28a745; color: white; }
+        a.file-link { color: #c59f00; text-decoration: underline; }
+        .section { margin: 30px 0; padding: 20px; border: 1px solid #e0e0e0; border-radius: 8px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Comprehensive CSS Analysis Report</h1>
+        
+        {%- if duplicates_html %}
+        <div class="section">
+            <h2>1. Duplicate Analysis</h2>
+            {{ duplicates_html }}
+        </div>
+        {%- endif %}
+        
+        {%- if unused_html %}
+        <div class="section">
+            <h2>2. Unused Selector Analysis</h2>
+            {{ unused_html }}
+        </div>
+        {%- endif %}
+        
+        {%- if structure_html %}
+        <div class="section">
+            <h2>3. Structure Analysis</h2>
+            {{ structure_html }}
+        </div>
+        {%- endif %}
+    </div>
+</body>
+</html>
+"""
+)
+
+
+@lru_cache(maxsize=None)
+def _compiled_template(name: str) -> Template:
+    """Compile one of the inline page templates once per process."""
+    sources = {"fallback": _FALLBACK_TEMPLATE_SRC, "comprehensive": _COMPREHENSIVE_TEMPLATE_SRC}
+    return _JINJA_ENV.from_string(sources[name])
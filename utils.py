@@ -2,15 +2,20 @@
 Utility functions for CSS Analyzer.
 """
 
+import mmap
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Set, Dict, Any, Tuple
+from typing import List, Set, Dict, Any, Iterator, Tuple
 import fnmatch
+from html import escape as html_escape
 import re
-from urllib.parse import quote
+from urllib.parse import quote, urlparse
 
 # Default directories to exclude from analysis
-DEFAULT_EXCLUDE_DIRS = {
+DEFAULT_EXCLUDE_DIRS = frozenset({
     'node_modules',
     'vendor',
     '.git',
@@ -28,14 +33,26 @@ DEFAULT_EXCLUDE_DIRS = {
     'env',
     '.env',
     '.tox'
-}
+})
 
 # Default file extensions to include
-DEFAULT_CSS_EXTENSIONS = {'.css', '.scss', '.sass', '.less'}
-DEFAULT_SOURCE_EXTENSIONS = {'.html', '.htm', '.php', '.js', '.jsx', '.ts', '.tsx', '.vue'}
+DEFAULT_CSS_EXTENSIONS = frozenset({'.css', '.scss', '.sass', '.less'})
+DEFAULT_SOURCE_EXTENSIONS = frozenset({'.html', '.htm', '.php', '.js', '.jsx', '.ts', '.tsx', '.vue'})
 
 # Subset used for page parsing (entry documents)
-PAGE_EXTENSIONS = {'.html', '.htm', '.php'}
+PAGE_EXTENSIONS = frozenset({'.html', '.htm', '.php'})
+
+# Extension -> bucket used by get_all_files to split one walk into CSS and source lists
+_EXT_CATEGORY = {
+    **{ext: 'source' for ext in DEFAULT_SOURCE_EXTENSIONS},
+    **{ext: 'css' for ext in DEFAULT_CSS_EXTENSIONS},
+}
+
+# Everything get_all_files collects, checked once per directory entry
+_SCANNED_EXTENSIONS = frozenset(_EXT_CATEGORY)
+
+# Characters that make an exclude/filter rule an fnmatch pattern
+_GLOB_CHARS = frozenset('*?[')
 
 # Default table cap used by reporters when --full is not specified
 DEFAULT_TABLE_CAP = 10
@@ -44,8 +61,18 @@ DEFAULT_TABLE_CAP = 10
 # Path normalization and link helpers
 # -------------------------------
 
+@lru_cache(maxsize=16384)
+def _fast_abs(path_str: str) -> str:
+    """Memoised normpath(abspath()); assumes the working directory does not change."""
+    return os.path.normpath(os.path.abspath(path_str))
+
 def to_abs(p: Path) -> Path:
-    return p.resolve()
+    """Make a path absolute and normalized without touching the filesystem.
+
+    Link labels and hrefs only need a lexical absolute path, so this avoids the
+    realpath/stat calls that Path.resolve() performs for every component.
+    """
+    return Path(_fast_abs(os.fspath(p)))
 
 # -------------------------------
 # Filtering helpers (whitelist/blacklist)
@@ -67,7 +94,8 @@ def build_file_filter(whitelist: List[str] | None, blacklist: List[str] | None):
     Rules:
     - Directory rules are written as "/dir/" (leading and trailing slash) and match
       if that segment appears in the POSIX path (case-insensitive).
-    - File rules are "name.ext" and match the basename (case-insensitive) exactly.
+    - File rules are "name.ext" and match the basename (case-insensitive) exactly,
+      or are fnmatch globs such as "*.min.css".
     - When whitelist is non-empty, only files matching at least one whitelist rule are allowed.
     - Regardless of whitelist, any file matching a blacklist rule is disallowed.
     """
@@ -90,6 +118,8 @@ def build_file_filter(whitelist: List[str] | None, blacklist: List[str] | None):
             # Ensure posix has trailing slash for substring check
             posix_check = posix if posix.endswith('/') else posix + '/'
             return seg in posix_check
+        elif _GLOB_CHARS.intersection(rule):
+            return fnmatch.fnmatchcase(name, rule)
         else:
             # filename.ext exact match
             return name == rule
@@ -127,7 +157,7 @@ def make_vscode_href(p: Path, line: int | None = None) -> str:
     # VS Code expects a POSIX-like path with drive letter (lowercase recommended)
     posix_path = p.as_posix()
     # Lowercase drive letter if present like 'D:/...'
-    if re.match(r'^[A-Za-z]:/', posix_path):
+    if posix_path[1:3] == ':/' and posix_path[0].isascii() and posix_path[0].isalpha():
         posix_path = posix_path[0].lower() + posix_path[1:]
     if line and isinstance(line, int) and line > 0:
         return f"vscode://file/{posix_path}:{line}"
@@ -154,41 +184,202 @@ def make_console_link_text(label: str, href: str):
     """Return tuple (text, style) usable by rich for hyperlinks in console."""
     return (label, f"link {href} bold yellow")
 
+_HTML_LINK_TEMPLATE = '<a href="{href}" target="_blank" class="file-link">{label}</a>'
+
 def make_html_link(label: str, href: str) -> str:
-    """Return a yellow-styled anchor tag for HTML reports."""
-    return f'<a href="{href}" target="_blank" class="file-link">{label}</a>'
+    """Return a yellow-styled anchor tag for HTML reports (label and href escaped)."""
+    return _HTML_LINK_TEMPLATE.format(href=html_escape(href, quote=True),
+                                      label=html_escape(label, quote=False))
 
-def get_css_files(path: Path, exclude_dirs: Set[str] = None, whitelist: List[str] | None = None, blacklist: List[str] | None = None) -> List[Path]:
+def _exclude_set(exclude_dirs: Set[str] | None) -> frozenset:
+    """Normalise an exclude_dirs argument once, before it is probed per directory."""
+    if exclude_dirs is None:
+        return DEFAULT_EXCLUDE_DIRS
+    if isinstance(exclude_dirs, frozenset):
+        return exclude_dirs
+    return frozenset(exclude_dirs)
+
+def _suffix(name: str) -> str:
+    """Lowercased extension of a bare file name, matching Path.suffix semantics."""
+    dot = name.rfind('.')
+    if dot <= 0 or dot == len(name) - 1:
+        return ''
+    return name[dot:].lower()
+
+def _suffix_matcher(extensions: Set[str]):
+    """Return a walker predicate testing a bare file name against extensions.
+
+    Uses one str.endswith() with a tuple of the (lowercase) extensions. A name
+    that is nothing but the extension (".css") has no suffix under _suffix()
+    rules, so it is rejected by the membership check.
     """
-    Get all CSS files from the given path.
+    def match(name: str, _endings=tuple(extensions), _extensions=frozenset(extensions)) -> bool:
+        lowered = name.lower()
+        return lowered.endswith(_endings) and lowered not in _extensions
+    return match
+
+def _walk_threads() -> int:
+    """Worker count for directory walks (CSS_ANALYSER_WALK_THREADS overrides)."""
+    try:
+        return max(1, int(os.environ.get('CSS_ANALYSER_WALK_THREADS', '')))
+    except ValueError:
+        # APFS serialises concurrent directory reads, so more threads don't help there
+        return min(4 if sys.platform == 'darwin' else 8, os.cpu_count() or 1)
+
+_WALK_THREADS = _walk_threads()
+
+@lru_cache(maxsize=32)
+def _dir_excluder(exclude_dirs: frozenset):
+    """Split an exclude set into (plain names, extra predicate or None).
+
+    Plain entries match a directory name exactly and stay a set lookup. Entries
+    with glob characters ("*.egg-info") are fnmatch patterns on the name, and
+    entries containing "/" ("tests/fixtures") match the trailing path segments.
+    """
+    names = frozenset(e for e in exclude_dirs if '/' not in e and not _GLOB_CHARS.intersection(e))
+    globs = [e for e in exclude_dirs if '/' not in e and e not in names]
+    tails = tuple('/' + e.strip('/') for e in exclude_dirs if '/' in e)
+    if not globs and not tails:
+        return names, None
+    glob_match = re.compile('|'.join(fnmatch.translate(g) for g in globs)).match if globs else None
+
+    def skip(name: str, path: str) -> bool:
+        if glob_match and glob_match(name):
+            return True
+        return bool(tails) and path.replace('\\', '/').endswith(tails)
+    return names, skip
+
+def _scan_dir(dirpath: str, match, exclude, found: List[Path], subdirs: List[str]) -> None:
+    """Scan one directory: append matching files to found and descendable dirs to subdirs."""
+    exclude_names, skip_dir = exclude
+    try:
+        it = os.scandir(dirpath)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if entry.name not in exclude_names and not entry.is_symlink():
+                    if skip_dir is None or not skip_dir(entry.name, entry.path):
+                        subdirs.append(entry.path)
+            elif match(entry.name):
+                found.append(Path(entry.path))
+
+def _scan_tree(dirpath: str, match, exclude) -> List[Path]:
+    """Depth-first scan of a directory tree using an explicit stack."""
+    found: List[Path] = []
+    stack = [dirpath]
+    while stack:
+        _scan_dir(stack.pop(), match, exclude, found, stack)
+    return found
+
+def _walk_files(path: Path, match, exclude_dirs: Set[str]) -> Iterator[Path]:
+    """Collect files under a directory whose name satisfies match(name).
+
+    Uses os.scandir so file/dir checks come from the directory entries instead
+    of extra stat calls. Like os.walk, symlinked directories are not descended
+    into and unreadable directories are skipped. When the root has several
+    subdirectories they are scanned on a thread pool, since the walk mostly
+    waits on the filesystem. Matches are yielded as each subtree finishes, in
+    no particular order; callers sort when order matters.
+    """
+    exclude = _dir_excluder(_exclude_set(exclude_dirs))
+    found: List[Path] = []
+    subdirs: List[str] = []
+    _scan_dir(os.fspath(path), match, exclude, found, subdirs)
+    yield from found
+    workers = min(_WALK_THREADS, len(subdirs))
+    if workers <= 1:
+        for d in subdirs:
+            yield from _scan_tree(d, match, exclude)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(lambda d: _scan_tree(d, match, exclude), subdirs):
+            yield from part
+
+@lru_cache(maxsize=32)
+def _walk_cached(root: str, mtime_ns: int, extensions: frozenset, exclude_dirs: frozenset) -> Tuple[Path, ...]:
+    """Memoised _walk_files keyed on the root and its mtime (see _walk_by_extension).
+
+    Subsets of _SCANNED_EXTENSIONS (pages, CSS, PHP) are split out of the one
+    cached full walk, so the tree is traversed once however many buckets the
+    run asks for.
+    """
+    if extensions != _SCANNED_EXTENSIONS and extensions <= _SCANNED_EXTENSIONS:
+        everything = _walk_cached(root, mtime_ns, _SCANNED_EXTENSIONS, exclude_dirs)
+        return tuple(p for p in everything if _suffix(p.name) in extensions)
+    return tuple(_walk_files(Path(root), _suffix_matcher(extensions), exclude_dirs))
+
+def _walk_by_extension(path: Path, extensions: Set[str], exclude_dirs: Set[str]) -> Tuple[Path, ...]:
+    """Files under a directory with one of the given extensions, reused across passes.
+
+    A single run walks the same tree several times (file discovery, page
+    parsing, CSS lookups by path suffix), so results are cached per root. The
+    root's mtime is part of the key as a cheap staleness check; it only sees
+    entries added or removed directly under the root, so call
+    clear_walk_cache() after changing a tree within the same process.
+    """
+    root = os.fspath(path)
+    try:
+        mtime_ns = os.stat(root).st_mtime_ns
+    except OSError:
+        return ()
+    return _walk_cached(root, mtime_ns, frozenset(extensions), _exclude_set(exclude_dirs))
+
+def clear_walk_cache() -> None:
+    """Forget memoised directory walks."""
+    _walk_cached.cache_clear()
+
+def get_all_files(path: Path, exclude_dirs: Set[str] = None, whitelist: List[str] | None = None, blacklist: List[str] | None = None) -> Tuple[List[Path], List[Path]]:
+    """
+    Get CSS and source files (HTML, PHP, JS) from the given path in one walk.
     
     Args:
         path: Path to a file or directory
-        exclude_dirs: Set of directory names to exclude from search
+        exclude_dirs: Directory names, name globs or trailing path rules to exclude from search
         
     Returns:
-        List of CSS file paths
+        Tuple of (CSS file paths, source file paths)
     """
-    if exclude_dirs is None:
-        exclude_dirs = DEFAULT_EXCLUDE_DIRS
+    exclude_dirs = _exclude_set(exclude_dirs)
     
-    css_files = []
+    files = []
     
     if path.is_file():
-        if path.suffix.lower() in DEFAULT_CSS_EXTENSIONS:
-            css_files.append(path)
+        files.append(path)
     elif path.is_dir():
-        for root, dirs, files in os.walk(path):
-            # Remove excluded directories
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            
-            for file in files:
-                file_path = Path(root) / file
-                if file_path.suffix.lower() in DEFAULT_CSS_EXTENSIONS:
-                    css_files.append(file_path)
+        files = _walk_by_extension(path, _SCANNED_EXTENSIONS, exclude_dirs)
     
     allowed = build_file_filter(whitelist, blacklist)
-    return sorted([p for p in css_files if allowed(p)])
+    css_files = []
+    source_files = []
+    for p in files:
+        category = _EXT_CATEGORY.get(_suffix(p.name))
+        if category == 'css':
+            css_files.append(p)
+        elif category == 'source':
+            source_files.append(p)
+    return (
+        sorted([p for p in css_files if allowed(p)]),
+        sorted([p for p in source_files if allowed(p)]),
+    )
+
+def get_css_files(path: Path, exclude_dirs: Set[str] = None, whitelist: List[str] | None = None, blacklist: List[str] | None = None) -> List[Path]:
+    """
+    Get all CSS files from the given path.
+    
+    Args:
+        path: Path to a file or directory
+        exclude_dirs: Directory names, name globs or trailing path rules to exclude from search
+        
+    Returns:
+        List of CSS file paths
+    """
+    return get_all_files(path, exclude_dirs, whitelist, blacklist)[0]
 
 def get_source_files(path: Path, exclude_dirs: Set[str] = None, whitelist: List[str] | None = None, blacklist: List[str] | None = None) -> List[Path]:
     """
@@ -196,91 +387,252 @@ def get_source_files(path: Path, exclude_dirs: Set[str] = None, whitelist: List[
     
     Args:
         path: Path to a file or directory
-        exclude_dirs: Set of directory names to exclude from search
+        exclude_dirs: Directory names, name globs or trailing path rules to exclude from search
         
     Returns:
         List of source file paths
     """
-    if exclude_dirs is None:
-        exclude_dirs = DEFAULT_EXCLUDE_DIRS
-    
-    source_files = []
-    
-    if path.is_file():
-        if path.suffix.lower() in DEFAULT_SOURCE_EXTENSIONS:
-            source_files.append(path)
-    elif path.is_dir():
-        for root, dirs, files in os.walk(path):
-            # Remove excluded directories
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            
-            for file in files:
-                file_path = Path(root) / file
-                if file_path.suffix.lower() in DEFAULT_SOURCE_EXTENSIONS:
-                    source_files.append(file_path)
-    
-    allowed = build_file_filter(whitelist, blacklist)
-    return sorted([p for p in source_files if allowed(p)])
+    return get_all_files(path, exclude_dirs, whitelist, blacklist)[1]
 
-def _iter_files(path: Path, include_exts: Set[str], exclude_dirs: Set[str]) -> List[Path]:
-    """Internal helper to iterate files by extensions under a path."""
-    files: List[Path] = []
+def _iter_files(path: Path, include_exts: Set[str], exclude_dirs: Set[str]) -> Iterator[Path]:
+    """Internal helper to iterate files by extensions under a path (unordered)."""
     if path.is_file():
         if path.suffix.lower() in include_exts:
-            files.append(path)
+            yield path
     elif path.is_dir():
-        for root, dirs, filenames in os.walk(path):
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            for name in filenames:
-                p = Path(root) / name
-                if p.suffix.lower() in include_exts:
-                    files.append(p)
-    return sorted(files)
+        yield from _walk_by_extension(path, include_exts, exclude_dirs)
 
-def _resolve_path(base: Path, href: str) -> Path:
-    """Resolve a possibly relative href against a base file path."""
+_EXTERNAL_URL_PREFIXES = ('http://', 'https://', '//')
+_QUERY_OR_HASH_RE = re.compile(r'[?#]')
+_CSS_IMPORT_RE = re.compile(r"@import\s+(?:url\(\s*)?[\'\"]?([^\'\"\)]+)")
+_CSS_IMPORT_BYTES_RE = re.compile(rb"@import\s+(?:url\(\s*)?[\'\"]?([^\'\"\)]+)")
+# Stylesheets larger than this are scanned for @import as raw bytes over mmap
+_MMAP_IMPORT_SCAN_MIN = 256 * 1024
+
+def _css_import_hrefs(css_path: Path) -> List[str]:
+    """Return the stripped @import targets of a stylesheet in source order.
+
+    Large (usually generated) stylesheets are scanned through a read-only
+    mmap with a bytes pattern, so only the captured hrefs are decoded and the
+    file never lands in the read_file_content cache.
+    """
+    try:
+        size = os.stat(css_path).st_size
+    except OSError:
+        size = 0
+    if size > _MMAP_IMPORT_SCAN_MIN:
+        try:
+            with open(css_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return [_decode_text(m.group(1), 'utf-8').strip() for m in _CSS_IMPORT_BYTES_RE.finditer(mm)]
+        except (OSError, ValueError):
+            pass
+    try:
+        content = read_file_content(css_path)
+    except Exception:
+        content = ''
+    return [m.group(1).strip() for m in _CSS_IMPORT_RE.finditer(content)]
+
+@lru_cache(maxsize=16384)
+def _resolve_cached(base_dir: str, href: str) -> str | None:
+    """String-level core of _resolve_path, memoised per (directory, href).
+
+    Pages in the same folder tend to link the same handful of stylesheets, so
+    most lookups are cache hits that skip the URL checks and normpath work.
+    """
     # Ignore external URLs
-    if re.match(r'^(https?:)?//', href) or href.startswith('data:'):
+    if href.startswith(_EXTERNAL_URL_PREFIXES) or href.startswith('data:'):
         return None
     # Remove query/hash parts
-    href_clean = re.split(r'[?#]', href)[0]
-    resolved = (base.parent / href_clean).resolve()
-    return resolved
+    href_clean = _QUERY_OR_HASH_RE.split(href, 1)[0]
+    return _fast_abs(os.path.join(base_dir, href_clean))
 
-def resolve_css_imports(entry_css: Path) -> List[Path]:
+def _resolve_path(base: Path, href: str) -> Path:
+    """Resolve a possibly relative href against a base file path."""
+    resolved = _resolve_cached(os.path.dirname(os.fspath(base)), href)
+    return Path(resolved) if resolved is not None else None
+
+def _canon(p: Path) -> str:
+    """Interned string form of an already resolved path.
+
+    The same stylesheet is listed in many page chains and in all_css; sharing
+    one string object keeps those small and lets set lookups hit on identity.
+    """
+    return sys.intern(str(p))
+
+# Entry stylesheet -> ((path, mtime_ns, size) for each chain member, ordered chain)
+_import_chain_cache: Dict[Path, Tuple[Tuple[Tuple[str, int, int], ...], List[Path]]] = {}
+
+def _stat_signature(paths: List[Path]) -> Tuple[Tuple[str, int, int], ...] | None:
+    """(path, mtime_ns, size) for each path, or None if any of them is gone."""
+    sig = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+        except OSError:
+            return None
+        sig.append((os.fspath(p), st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+def clear_import_cache() -> None:
+    """Forget @import chains memoised by resolve_css_imports."""
+    _import_chain_cache.clear()
+
+def resolve_css_imports(entry_css: Path, cache: Dict[Path, List[Path]] | None = None) -> List[Path]:
     """
     Resolve @import chains for a given CSS file.
 
     Depth-first traversal, returns a flattened ordered list where imported
     stylesheets appear before the importing stylesheet. Cycles are prevented.
+
+    Results are memoised per entry path and reused while every file in the
+    chain keeps its mtime and size; an @import target that did not exist at
+    the time is not re-checked, so call clear_import_cache() after adding one.
+    A caller doing one pass over a tree can also pass its own cache dict, whose
+    hits skip that mtime/size check entirely.
     """
+    if cache is not None:
+        hit = cache.get(entry_css)
+        if hit is not None:
+            return list(hit)
+    cached = _import_chain_cache.get(entry_css)
+    if cached is not None and _stat_signature(cached[1]) == cached[0]:
+        if cache is not None:
+            cache[entry_css] = cached[1]
+        return list(cached[1])
+
     visited: Set[Path] = set()
     ordered: List[Path] = []
 
-    import_pattern = re.compile(r"@import\s+(?:url\(\s*)?[\'\"]?([^\'\"\)]+)")
+    def _children(css_path: Path) -> Iterator[Path]:
+        for href in _css_import_hrefs(css_path):
+            child = _resolve_path(css_path, href)
+            if child and child.suffix.lower() in DEFAULT_CSS_EXTENSIONS:
+                yield child
 
-    def dfs(css_path: Path):
+    def _enter(css_path: Path) -> Tuple[Path, Iterator[Path]] | None:
         css_path = css_path.resolve()
         if css_path in visited or not css_path.exists():
-            return
+            return None
         visited.add(css_path)
-        try:
-            content = read_file_content(css_path)
-        except Exception:
-            content = ''
+        return css_path, _children(css_path)
+
+    # Iterative post-order DFS; each frame holds a node and its remaining
+    # imports, so deep chains do not hit the recursion limit
+    stack: List[Tuple[Path, Iterator[Path]]] = []
+    frame = _enter(entry_css)
+    if frame:
+        stack.append(frame)
+    while stack:
+        css_path, children = stack[-1]
+        for child in children:
+            if child in visited:
+                # cycle detected; skip further descent
+                continue
+            frame = _enter(child)
+            if frame:
+                stack.append(frame)
+                break
+        else:
+            stack.pop()
+            ordered.append(css_path)
 
-        for match in import_pattern.finditer(content):
-            href = match.group(1).strip()
-            child = _resolve_path(css_path, href)
-            if child and child.suffix.lower() in DEFAULT_CSS_EXTENSIONS:
-                if child in visited:
-                    # cycle detected; skip further descent
-                    continue
-                dfs(child)
-        ordered.append(css_path)
+    if ordered:
+        sig = _stat_signature(ordered)
+        if sig is not None:
+            _import_chain_cache[entry_css] = (sig, ordered)
+    if cache is not None:
+        cache[entry_css] = ordered
+    return list(ordered)
 
-    dfs(entry_css)
-    return ordered
+# -------------------------------
+# Page and PHP scanning patterns
+# -------------------------------
+
+# Stylesheet links, inline @imports and script tags in pages
+_LINK_RE = re.compile(r"<link[^>]+rel=[\"\']stylesheet[\"\'][^>]*href=[\"\']([^\"\']+)[\"\']", re.IGNORECASE)
+_STYLE_IMPORT_RE = re.compile(r"@import\s+(?:url\(\s*)?[\'\"]?([^\'\"\)]+)", re.IGNORECASE)
+_SCRIPT_SRC_RE = re.compile(r"<script[^>]*src=[\"\']([^\"\']+)[\"\']", re.IGNORECASE)
+# Absolute http(s) URLs in hrefs
+_HTTP_URL_RE = re.compile(r'^https?://')
+
+# JS that injects <link rel="stylesheet"> at runtime
+_JS_DYNAMIC_LINK_PATTERNS = (
+    re.compile(r"createElement\(\s*['\"]link['\"]\s*\)", re.IGNORECASE),
+    re.compile(r"\.setAttribute\(\s*['\"]rel['\"],\s*['\"]stylesheet['\"]\s*\)", re.IGNORECASE),
+    re.compile(r"\.href\s*=\s*['\"]([^'\"]+)['\"]", re.IGNORECASE),
+)
+
+# Capture define('CONST', 'value'); string values only
+_DEFINE_RE = re.compile(r"define\(\s*['\"]([A-Z0-9_]+)['\"]\s*,\s*['\"]([^'\"]*)['\"]\s*\)", re.IGNORECASE)
+# wp_enqueue_style( ..., "path.css" )
+_ENQUEUE_STYLE_STRING_RE = re.compile(r"wp_(?:enqueue|register)_style\s*\(\s*[^,]*,\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
+# wp_enqueue_style( ..., CONST . 'path.css' )
+_ENQUEUE_STYLE_CONST_CONCAT_RE = re.compile(r"wp_(?:enqueue|register)_style\s*\(\s*[^,]*,\s*([A-Z_][A-Z0-9_]*)\s*\.\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
+# wp_enqueue_style( ..., plugins_url('path.css', ...) )
+_ENQUEUE_STYLE_PLUGINS_URL_RE = re.compile(r"wp_(?:enqueue|register)_style\s*\(\s*[^,]*,\s*plugins_url\s*\(\s*['\"]([^'\"]+\.css)['\"][^)]*\)", re.IGNORECASE)
+# wp_enqueue_style( ..., plugin_dir_url(__FILE__) . 'path.css' )
+_ENQUEUE_STYLE_PLUGIN_DIR_URL_CONCAT_RE = re.compile(r"wp_(?:enqueue|register)_style\s*\(\s*[^,]*,\s*plugin_dir_url\s*\(\s*__FILE__\s*\)\s*\.\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
+# wp_enqueue_style( ..., get_stylesheet_directory_uri() . '/path.css' ) or get_template_directory_uri()
+_ENQUEUE_STYLE_THEME_DIR_URI_CONCAT_RE = re.compile(r"wp_(?:enqueue|register)_style\s*\(\s*[^,]*,\s*get_(?:stylesheet|template)_directory_uri\s*\(\s*\)\s*\.\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
+# include/require patterns with string literal
+_PHP_INCLUDE_LITERAL_RE = re.compile(r"(?:include|include_once|require|require_once)\s*\(\s*['\"]([^'\"]+\.php)['\"]\s*\)", re.IGNORECASE)
+# include/require with CONST . 'file.php'
+_PHP_INCLUDE_CONST_CONCAT_RE = re.compile(r"(?:include|include_once|require|require_once)\s*\(\s*([A-Z_][A-Z0-9_]*)\s*\.\s*['\"]([^'\"]+\.php)['\"]\s*\)", re.IGNORECASE)
+
+# Additional patterns for include/require variations
+_PHP_INCLUDE_DIRNAME_RE = re.compile(r"(?:include|include_once|require|require_once)\s*\(\s*dirname\(\s*__FILE__\s*\)\s*\.\s*['\"]([^'\"]+\.php)['\"]\s*\)", re.IGNORECASE)
+_PHP_INCLUDE_DIR_RE = re.compile(r"(?:include|include_once|require|require_once)\s*\(\s*__DIR__\s*\.\s*['\"]([^'\"]+\.php)['\"]\s*\)", re.IGNORECASE)
+_PHP_INCLUDE_PLUGIN_DIR_PATH_RE = re.compile(r"(?:include|include_once|require|require_once)\s*\(\s*plugin_dir_path\s*\(\s*__FILE__\s*\)\s*\.\s*['\"]([^'\"]+\.php)['\"]\s*\)", re.IGNORECASE)
+_PHP_INCLUDE_THEME_DIR_RE = re.compile(r"(?:include|include_once|require|require_once)\s*\(\s*get_(?:stylesheet|template)_directory\s*\(\s*\)\s*\.\s*['\"]([^'\"]+\.php)['\"]\s*\)", re.IGNORECASE)
+
+# Register/enqueue by handle patterns
+_REGISTER_STYLE_STRING_RE = re.compile(r"wp_register_style\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
+_REGISTER_STYLE_CONST_CONCAT_RE = re.compile(r"wp_register_style\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*([A-Z_][A-Z0-9_]*)\s*\.\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
+_REGISTER_STYLE_PLUGINS_URL_RE = re.compile(r"wp_register_style\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*plugins_url\s*\(\s*['\"]([^'\"]+\.css)['\"][^)]*\)", re.IGNORECASE)
+_REGISTER_STYLE_PLUGIN_DIR_URL_CONCAT_RE = re.compile(r"wp_register_style\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*plugin_dir_url\s*\(\s*__FILE__\s*\)\s*\.\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
+_REGISTER_STYLE_THEME_DIR_URI_CONCAT_RE = re.compile(r"wp_register_style\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*get_(?:stylesheet|template)_directory_uri\s*\(\s*\)\s*\.\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
+_ENQUEUE_HANDLE_RE = re.compile(r"wp_enqueue_style\s*\(\s*['\"]([^'\"]+)['\"]", re.IGNORECASE)
+
+# Source expression kinds understood by _resolve_css_from_php, in scan order
+_REGISTER_EXPR_TYPES = ('string', 'const_concat', 'plugins_url', 'plugin_dir_url_concat', 'theme_dir_uri_concat')
+_REGISTER_STYLE_PATTERNS = dict(zip(_REGISTER_EXPR_TYPES, (
+    _REGISTER_STYLE_STRING_RE, _REGISTER_STYLE_CONST_CONCAT_RE, _REGISTER_STYLE_PLUGINS_URL_RE,
+    _REGISTER_STYLE_PLUGIN_DIR_URL_CONCAT_RE, _REGISTER_STYLE_THEME_DIR_URI_CONCAT_RE,
+)))
+_ENQUEUE_STYLE_PATTERNS = dict(zip(_REGISTER_EXPR_TYPES, (
+    _ENQUEUE_STYLE_STRING_RE, _ENQUEUE_STYLE_CONST_CONCAT_RE, _ENQUEUE_STYLE_PLUGINS_URL_RE,
+    _ENQUEUE_STYLE_PLUGIN_DIR_URL_CONCAT_RE, _ENQUEUE_STYLE_THEME_DIR_URI_CONCAT_RE,
+)))
+_PHP_CALL_SITE_PATTERNS = {
+    'style': (*_REGISTER_STYLE_PATTERNS.values(), *_ENQUEUE_STYLE_PATTERNS.values(), _ENQUEUE_HANDLE_RE),
+    'include': (_PHP_INCLUDE_LITERAL_RE, _PHP_INCLUDE_CONST_CONCAT_RE, _PHP_INCLUDE_DIRNAME_RE,
+                _PHP_INCLUDE_DIR_RE, _PHP_INCLUDE_PLUGIN_DIR_PATH_RE, _PHP_INCLUDE_THEME_DIR_RE),
+}
+# Every pattern above starts at one of these call sites
+_PHP_CALL_SITE_RE = re.compile(
+    r"(?P<style>wp_(?:enqueue|register)_style\s*\()|(?P<include>(?:include|require)(?:_once)?\s*\()",
+    re.IGNORECASE,
+)
+
+
+def _match_php_call_sites(txt: str) -> Dict[re.Pattern, List[re.Match]]:
+    """Run all style/include patterns over txt in a single pass.
+
+    Returns the same matches each pattern's own finditer() would produce,
+    keyed by pattern, but only tries patterns at candidate call sites.
+    """
+    matches: Dict[re.Pattern, List[re.Match]] = {}
+    last_end: Dict[re.Pattern, int] = {}
+    for site in _PHP_CALL_SITE_RE.finditer(txt):
+        pos = site.start()
+        for rx in _PHP_CALL_SITE_PATTERNS[site.lastgroup]:
+            if pos < last_end.get(rx, 0):
+                continue
+            m = rx.match(txt, pos)
+            if m:
+                matches.setdefault(rx, []).append(m)
+                last_end[rx] = m.end()
+    return matches
 
 def parse_html_for_css(path: Path, exclude_dirs: Set[str] = None, whitelist: List[str] | None = None, blacklist: List[str] | None = None) -> Dict[str, Any]:
     """
@@ -291,26 +643,40 @@ def parse_html_for_css(path: Path, exclude_dirs: Set[str] = None, whitelist: Lis
       - all_css: set([...])
       - unreferenced_css: set([...])
     """
-    if exclude_dirs is None:
-        exclude_dirs = DEFAULT_EXCLUDE_DIRS
+    exclude_dirs = _exclude_set(exclude_dirs)
 
     pages: Dict[str, Dict[str, Any]] = {}
     all_css: Set[str] = set()
     uncertain_css: Dict[str, Set[str]] = {}
 
     allowed = build_file_filter(whitelist, blacklist)
-    page_files = [p for p in _iter_files(path, PAGE_EXTENSIONS, exclude_dirs) if allowed(p)]
+    page_files = sorted([p for p in _iter_files(path, PAGE_EXTENSIONS, exclude_dirs) if allowed(p)])
 
-    # Patterns
-    link_pattern = re.compile(r"<link[^>]+rel=[\"\']stylesheet[\"\'][^>]*href=[\"\']([^\"\']+)[\"\']", re.IGNORECASE)
-    style_import_pattern = re.compile(r"@import\s+(?:url\(\s*)?[\'\"]?([^\'\"\)]+)", re.IGNORECASE)
-    script_src_pattern = re.compile(r"<script[^>]*src=[\"\']([^\"\']+)[\"\']", re.IGNORECASE)
+    # Resolve the workspace CSS once: suffix lookups for PHP-enqueued styles and
+    # the unreferenced-CSS check at the end both reuse it instead of re-walking
+    workspace_css: List[Tuple[Path, Path, str]] = []
+    for f in sorted(_iter_files(path, DEFAULT_CSS_EXTENSIONS, exclude_dirs)):
+        try:
+            resolved = f.resolve()
+        except Exception:
+            continue
+        workspace_css.append((f, resolved, str(resolved).replace('\\', '/').lower()))
+
+    # Nothing loads any CSS without pages; skip PHP defines and the page scan
+    if not page_files:
+        return {
+            'pages': pages,
+            'all_css': [],
+            'unreferenced_css': sorted({_canon(resolved) for f, resolved, _ in workspace_css if allowed(f)})
+        }
+
+    # File name -> workspace_css entries (in sorted order) for suffix lookups
+    css_by_name: Dict[str, List[Tuple[Path, Path, str]]] = {}
+    for entry in workspace_css:
+        css_by_name.setdefault(entry[2].rsplit('/', 1)[-1], []).append(entry)
 
-    js_dynamic_link_patterns = [
-        re.compile(r"createElement\(\s*['\"]link['\"]\s*\)", re.IGNORECASE),
-        re.compile(r"\.setAttribute\(\s*['\"]rel['\"],\s*['\"]stylesheet['\"]\s*\)", re.IGNORECASE),
-        re.compile(r"\.href\s*=\s*['\"]([^'\"]+)['\"]", re.IGNORECASE),
-    ]
+    # Flattened @import chains shared by every page in this run
+    imports_cache: Dict[Path, List[Path]] = {}
 
     # Collect JS files referenced by pages (to narrow dynamic detection scope)
     js_files_for_pages: Dict[Path, List[Path]] = {}
@@ -318,33 +684,12 @@ def parse_html_for_css(path: Path, exclude_dirs: Set[str] = None, whitelist: Lis
     # -------------------------------
     # PHP scanning helpers
     # -------------------------------
-    # Capture define('CONST', 'value'); string values only
-    define_pattern = re.compile(r"define\(\s*['\"]([A-Z0-9_]+)['\"]\s*,\s*['\"]([^'\"]*)['\"]\s*\)", re.IGNORECASE)
-    # wp_enqueue_style( ..., "path.css" )
-    enqueue_style_string = re.compile(r"wp_(?:enqueue|register)_style\s*\(\s*[^,]*,\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
-    # wp_enqueue_style( ..., CONST . 'path.css' )
-    enqueue_style_const_concat = re.compile(r"wp_(?:enqueue|register)_style\s*\(\s*[^,]*,\s*([A-Z_][A-Z0-9_]*)\s*\.\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
-    # wp_enqueue_style( ..., plugins_url('path.css', ...) )
-    enqueue_style_plugins_url = re.compile(r"wp_(?:enqueue|register)_style\s*\(\s*[^,]*,\s*plugins_url\s*\(\s*['\"]([^'\"]+\.css)['\"][^)]*\)", re.IGNORECASE)
-    # wp_enqueue_style( ..., plugin_dir_url(__FILE__) . 'path.css' )
-    enqueue_style_plugin_dir_url_concat = re.compile(r"wp_(?:enqueue|register)_style\s*\(\s*[^,]*,\s*plugin_dir_url\s*\(\s*__FILE__\s*\)\s*\.\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
-    # wp_enqueue_style( ..., get_stylesheet_directory_uri() . '/path.css' ) or get_template_directory_uri()
-    enqueue_style_theme_dir_uri_concat = re.compile(r"wp_(?:enqueue|register)_style\s*\(\s*[^,]*,\s*get_(?:stylesheet|template)_directory_uri\s*\(\s*\)\s*\.\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
-    # include/require patterns with string literal
-    php_include_literal = re.compile(r"(?:include|include_once|require|require_once)\s*\(\s*['\"]([^'\"]+\.php)['\"]\s*\)", re.IGNORECASE)
-    # include/require with CONST . 'file.php'
-    php_include_const_concat = re.compile(r"(?:include|include_once|require|require_once)\s*\(\s*([A-Z_][A-Z0-9_]*)\s*\.\s*['\"]([^'\"]+\.php)['\"]\s*\)", re.IGNORECASE)
-
     # Gather PHP defines across the workspace under path for resolving constants
     def _gather_php_defines(root: Path) -> Dict[str, Dict[str, Any]]:
         consts: Dict[str, Dict[str, Any]] = {}
-        php_files = _iter_files(root, {'.php'}, exclude_dirs)
-        for pf in php_files:
-            try:
-                txt = read_file_content(pf)
-            except Exception:
-                continue
-            for m in define_pattern.finditer(txt):
+        php_files = sorted(_iter_files(root, {'.php'}, exclude_dirs))
+        for pf, txt in read_many(php_files).items():
+            for m in _DEFINE_RE.finditer(txt):
                 name = m.group(1)
                 val = m.group(2)
                 consts[name] = {'value': val, 'file': str(pf.resolve())}
@@ -353,17 +698,17 @@ def parse_html_for_css(path: Path, exclude_dirs: Set[str] = None, whitelist: Lis
     php_constants = _gather_php_defines(path)
 
     # Resolve a CSS asset path from different PHP enqueue patterns
-    def _resolve_css_from_php(expr_type: str, page_file: Path, match: re.Match) -> Path | None:
+    def _resolve_css_from_php(expr_type: str, page_file: Path, groups: Tuple[str, ...]) -> Path | None:
         try:
             if expr_type == 'string':
-                raw = match.group(1)
+                raw = groups[0]
                 return _resolve_asset_path(raw, page_file, php_constants)
             if expr_type == 'const_concat':
-                const = match.group(1)
-                tail = match.group(2)
+                const = groups[0]
+                tail = groups[1]
                 # If tail is absolute-like '/foo/bar.css', try suffix search in project
                 if tail.startswith('/'):
-                    cand = _find_css_by_suffix(path, tail.lstrip('/'))
+                    cand = _find_css_by_suffix(tail.lstrip('/'))
                     if cand:
                         return cand
                 base = None
@@ -382,38 +727,38 @@ def parse_html_for_css(path: Path, exclude_dirs: Set[str] = None, whitelist: Lis
                     if found:
                         return found
                     base = page_file.parent
-                return (base / tail).resolve()
+                return to_abs(base / tail)
             if expr_type == 'plugins_url':
-                tail = match.group(1)
+                tail = groups[0]
                 if tail.startswith('/'):
-                    cand = _find_css_by_suffix(path, tail.lstrip('/'))
+                    cand = _find_css_by_suffix(tail.lstrip('/'))
                     if cand:
                         return cand
                 # Try to locate by walking up from current file
                 found = _find_upwards_for_tail(page_file, tail)
                 if found:
                     return found
-                return (page_file.parent / tail).resolve()
+                return to_abs(page_file.parent / tail)
             if expr_type == 'plugin_dir_url_concat':
-                tail = match.group(1)
+                tail = groups[0]
                 if tail.startswith('/'):
-                    cand = _find_css_by_suffix(path, tail.lstrip('/'))
+                    cand = _find_css_by_suffix(tail.lstrip('/'))
                     if cand:
                         return cand
                 found = _find_upwards_for_tail(page_file, tail)
                 if found:
                     return found
-                return (page_file.parent / tail).resolve()
+                return to_abs(page_file.parent / tail)
             if expr_type == 'theme_dir_uri_concat':
-                tail = match.group(1)
+                tail = groups[0]
                 if tail.startswith('/'):
-                    cand = _find_css_by_suffix(path, tail.lstrip('/'))
+                    cand = _find_css_by_suffix(tail.lstrip('/'))
                     if cand:
                         return cand
                 found = _find_upwards_for_tail(page_file, tail)
                 if found:
                     return found
-                return (page_file.parent / tail).resolve()
+                return to_abs(page_file.parent / tail)
         except Exception:
             return None
         return None
@@ -424,16 +769,15 @@ def parse_html_for_css(path: Path, exclude_dirs: Set[str] = None, whitelist: Lis
         try:
             p = Path(raw)
             if p.suffix.lower() == '.css' and p.exists():
-                return p.resolve()
+                return to_abs(p)
         except Exception:
             pass
         # If URL, take the path part and try to map to local by suffix search
-        if re.match(r'^https?://', raw) or raw.startswith('//'):
+        if _HTTP_URL_RE.match(raw) or raw.startswith('//'):
             try:
-                from urllib.parse import urlparse
                 u = urlparse(raw if raw.startswith('http') else 'http:' + raw)
                 url_path = u.path.lstrip('/')
-                cand = _find_css_by_suffix(path, url_path)
+                cand = _find_css_by_suffix(url_path)
                 if cand:
                     return cand
             except Exception:
@@ -442,156 +786,91 @@ def parse_html_for_css(path: Path, exclude_dirs: Set[str] = None, whitelist: Lis
         rel = raw.strip()
         # Normalize potential concatenated slashes
         rel = rel.replace('\\', '/').replace('//', '/')
-        candidate = (base_file.parent / rel).resolve()
+        candidate = to_abs(base_file.parent / rel)
         if candidate.suffix.lower() == '.css' and candidate.exists():
             return candidate
         # If startswith '/', attempt suffix search in project
         if rel.startswith('/'):
-            cand = _find_css_by_suffix(path, rel.lstrip('/'))
+            cand = _find_css_by_suffix(rel.lstrip('/'))
             if cand:
                 return cand
         return None
 
-    def _find_css_by_suffix(root: Path, suffix: str) -> Path | None:
-        """Find a CSS file under root that ends with the given suffix (path fragment)."""
+    def _find_css_by_suffix(suffix: str) -> Path | None:
+        """Find a workspace CSS file that ends with the given suffix (path fragment)."""
         suffix_norm = suffix.replace('\\', '/').lower()
-        for f in _iter_files(root, DEFAULT_CSS_EXTENSIONS, exclude_dirs):
-            try:
-                s = str(f.resolve()).replace('\\', '/').lower()
-                if s.endswith(suffix_norm):
-                    return f.resolve()
-            except Exception:
-                continue
+        # A suffix spanning a '/' can only match files with exactly its last
+        # component as name; bare names may match mid-name, so scan everything
+        if '/' in suffix_norm:
+            candidates = css_by_name.get(suffix_norm.rsplit('/', 1)[-1], ())
+        else:
+            candidates = workspace_css
+        for _, resolved, norm in candidates:
+            if norm.endswith(suffix_norm):
+                return resolved
         return None
 
-    def _find_upwards_for_tail(start_file: Path, tail: str, max_levels: int = 6) -> Path | None:
+    def _find_upwards_for_tail(start_file: Path, tail: str, max_levels: int = 6, suffix: str = '.css') -> Path | None:
         """From start_file directory, walk up to max_levels and check for tail path existence."""
         tail_norm = tail.replace('\\', '/')
+        # Only hits with the wanted suffix are returned, and it does not depend on the level
+        if Path(tail_norm).suffix.lower() != suffix:
+            return None
+        if os.path.isabs(tail_norm):
+            # Joining an absolute tail ignores cur, so there is one candidate
+            max_levels = 1
         cur = start_file.parent
         for _ in range(max_levels):
-            candidate = (cur / tail_norm).resolve()
-            if candidate.exists() and candidate.suffix.lower() == '.css':
-                return candidate
+            candidate = cur / tail_norm
+            if candidate.is_file():
+                return to_abs(candidate)
             if cur == cur.parent:
                 break
             cur = cur.parent
         return None
 
-    # Additional patterns for include/require variations
-    php_include_dirname = re.compile(r"(?:include|include_once|require|require_once)\s*\(\s*dirname\(\s*__FILE__\s*\)\s*\\.\s*['\"]([^'\"]+\.php)['\"]\s*\)", re.IGNORECASE)
-    php_include_dir = re.compile(r"(?:include|include_once|require|require_once)\s*\(\s*__DIR__\s*\\.\s*['\"]([^'\"]+\.php)['\"]\s*\)", re.IGNORECASE)
-    php_include_plugin_dir_path = re.compile(r"(?:include|include_once|require|require_once)\s*\(\s*plugin_dir_path\s*\(\s*__FILE__\s*\)\s*\\.\s*['\"]([^'\"]+\.php)['\"]\s*\)", re.IGNORECASE)
-    php_include_theme_dir = re.compile(r"(?:include|include_once|require|require_once)\s*\(\s*get_(?:stylesheet|template)_directory\s*\(\s*\)\s*\\.\s*['\"]([^'\"]+\.php)['\"]\s*\)", re.IGNORECASE)
-
-    # Register/enqueue by handle patterns
-    register_style_string = re.compile(r"wp_register_style\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
-    register_style_const_concat = re.compile(r"wp_register_style\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*([A-Z_][A-Z0-9_]*)\s*\.\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
-    register_style_plugins_url = re.compile(r"wp_register_style\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*plugins_url\s*\(\s*['\"]([^'\"]+\.css)['\"][^)]*\)", re.IGNORECASE)
-    register_style_plugin_dir_url_concat = re.compile(r"wp_register_style\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*plugin_dir_url\s*\(\s*__FILE__\s*\)\s*\.\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
-    register_style_theme_dir_uri_concat = re.compile(r"wp_register_style\s*\(\s*['\"]([^'\"]+)['\"]\s*,\s*get_(?:stylesheet|template)_directory_uri\s*\(\s*\)\s*\.\s*['\"]([^'\"]+\.css)['\"]", re.IGNORECASE)
-    enqueue_handle_pattern = re.compile(r"wp_enqueue_style\s*\(\s*['\"]([^'\"]+)['\"]", re.IGNORECASE)
-
-    def _scan_php_for_css(page: Path, visited: Set[Path], handle_map: Dict[str, Path], enqueued_handles: Set[str]) -> Tuple[List[Path], List[Path]]:
-        """Return (css_files, included_php_files) found in a PHP file. Updates handle_map and enqueued_handles in place."""
+    # PHP file -> (css_files, includes, registered (handle, css) pairs, enqueued handles).
+    # Pages share core includes, so each file is scanned once per call; the
+    # per-page BFS below still keeps its own visited set and handle map.
+    php_scan_memo: Dict[Path, Tuple[List[Path], List[Path], List[Tuple[str, Path]], List[str]]] = {}
+
+    def _scan_php_file(page: Path, txt: str | None = None) -> Tuple[List[Path], List[Path], List[Tuple[str, Path]], List[str]]:
+        """Scan one PHP file for enqueued/registered CSS and includes (memoised); txt skips the read."""
+        cached = php_scan_memo.get(page)
+        if cached is not None:
+            return cached
         css_found: List[Path] = []
         includes: List[Path] = []
-        if page in visited:
-            return css_found, includes
-        visited.add(page)
-        txt = read_file_content(page)
+        registered: List[Tuple[str, Path]] = []
+        handles: List[str] = []
+        if txt is None:
+            txt = read_file_content(page)
         if not txt:
-            return css_found, includes
+            return php_scan_memo.setdefault(page, (css_found, includes, registered, handles))
+        matches = _match_php_call_sites(txt)
         # Register style patterns to populate handle_map
-        for m in register_style_string.finditer(txt):
-            handle = m.group(1)
-            pth = _resolve_css_from_php('string', page, m)
-            if pth and pth.exists():
-                handle_map[handle] = pth
-        for m in register_style_const_concat.finditer(txt):
-            handle = m.group(1)
-            # build a fake match-like object for const_concat for _resolve_css_from_php expectations
-            # Here groups are (handle, CONST, tail), but resolver expects (CONST, tail)
-            class _M:
-                def __init__(self, const, tail):
-                    self._const = const
-                    self._tail = tail
-                def group(self, idx):
-                    if idx == 1:
-                        return self._const
-                    if idx == 2:
-                        return self._tail
-                    raise IndexError
-            pth = _resolve_css_from_php('const_concat', page, _M(m.group(2), m.group(3)))
-            if pth and pth.exists():
-                handle_map[handle] = pth
-        for m in register_style_plugins_url.finditer(txt):
-            handle = m.group(1)
-            class _M2:
-                def __init__(self, tail):
-                    self._tail = tail
-                def group(self, idx):
-                    if idx == 1:
-                        return self._tail
-                    raise IndexError
-            pth = _resolve_css_from_php('plugins_url', page, _M2(m.group(2)))
-            if pth and pth.exists():
-                handle_map[handle] = pth
-        for m in register_style_plugin_dir_url_concat.finditer(txt):
-            handle = m.group(1)
-            class _M3:
-                def __init__(self, tail):
-                    self._tail = tail
-                def group(self, idx):
-                    if idx == 1:
-                        return self._tail
-                    raise IndexError
-            pth = _resolve_css_from_php('plugin_dir_url_concat', page, _M3(m.group(2)))
-            if pth and pth.exists():
-                handle_map[handle] = pth
-        for m in register_style_theme_dir_uri_concat.finditer(txt):
-            handle = m.group(1)
-            class _M4:
-                def __init__(self, tail):
-                    self._tail = tail
-                def group(self, idx):
-                    if idx == 1:
-                        return self._tail
-                    raise IndexError
-            pth = _resolve_css_from_php('theme_dir_uri_concat', page, _M4(m.group(2)))
-            if pth and pth.exists():
-                handle_map[handle] = pth
+        for expr_type in _REGISTER_EXPR_TYPES:
+            for m in matches.get(_REGISTER_STYLE_PATTERNS[expr_type], ()):
+                groups = m.groups()
+                pth = _resolve_css_from_php(expr_type, page, groups[1:])
+                if pth and pth.exists():
+                    registered.append((groups[0], pth))
         # Enqueue patterns
-        for m in enqueue_style_string.finditer(txt):
-            pth = _resolve_css_from_php('string', page, m)
-            if pth and pth.exists():
-                css_found.append(pth)
-        for m in enqueue_style_const_concat.finditer(txt):
-            pth = _resolve_css_from_php('const_concat', page, m)
-            if pth and pth.exists():
-                css_found.append(pth)
-        for m in enqueue_style_plugins_url.finditer(txt):
-            pth = _resolve_css_from_php('plugins_url', page, m)
-            if pth and pth.exists():
-                css_found.append(pth)
-        for m in enqueue_style_plugin_dir_url_concat.finditer(txt):
-            pth = _resolve_css_from_php('plugin_dir_url_concat', page, m)
-            if pth and pth.exists():
-                css_found.append(pth)
-        for m in enqueue_style_theme_dir_uri_concat.finditer(txt):
-            pth = _resolve_css_from_php('theme_dir_uri_concat', page, m)
-            if pth and pth.exists():
-                css_found.append(pth)
+        for expr_type in _REGISTER_EXPR_TYPES:
+            for m in matches.get(_ENQUEUE_STYLE_PATTERNS[expr_type], ()):
+                pth = _resolve_css_from_php(expr_type, page, m.groups())
+                if pth and pth.exists():
+                    css_found.append(pth)
         # Enqueue by handle; resolve later after includes scanned
-        for m in enqueue_handle_pattern.finditer(txt):
-            handle = m.group(1)
-            enqueued_handles.add(handle)
+        for m in matches.get(_ENQUEUE_HANDLE_RE, ()):
+            handles.append(m.group(1))
         # Includes
-        for m in php_include_literal.finditer(txt):
+        for m in matches.get(_PHP_INCLUDE_LITERAL_RE, ()):
             inc_rel = m.group(1)
-            inc_path = (page.parent / inc_rel).resolve()
+            inc_path = to_abs(page.parent / inc_rel)
             if inc_path.exists() and inc_path.suffix.lower() == '.php':
                 includes.append(inc_path)
-        for m in php_include_const_concat.finditer(txt):
+        for m in matches.get(_PHP_INCLUDE_CONST_CONCAT_RE, ()):
             const = m.group(1)
             tail = m.group(2)
             base = None
@@ -604,62 +883,77 @@ def parse_html_for_css(path: Path, exclude_dirs: Set[str] = None, whitelist: Lis
                         base = b
             if base is None:
                 base = page.parent
-            inc_path = (base / tail).resolve()
+            inc_path = to_abs(base / tail)
             if inc_path.exists() and inc_path.suffix.lower() == '.php':
                 includes.append(inc_path)
         # dirname(__FILE__) . '/inc/foo.php'
-        for m in php_include_dirname.finditer(txt):
+        for m in matches.get(_PHP_INCLUDE_DIRNAME_RE, ()):
             tail = m.group(1)
-            inc_path = (page.parent / tail.lstrip('/')).resolve()
+            inc_path = to_abs(page.parent / tail.lstrip('/'))
             if inc_path.exists() and inc_path.suffix.lower() == '.php':
                 includes.append(inc_path)
         # __DIR__ . '/inc/foo.php'
-        for m in php_include_dir.finditer(txt):
+        for m in matches.get(_PHP_INCLUDE_DIR_RE, ()):
             tail = m.group(1)
-            inc_path = (page.parent / tail.lstrip('/')).resolve()
+            inc_path = to_abs(page.parent / tail.lstrip('/'))
             if inc_path.exists() and inc_path.suffix.lower() == '.php':
                 includes.append(inc_path)
         # plugin_dir_path(__FILE__) . 'includes/foo.php'
-        for m in php_include_plugin_dir_path.finditer(txt):
+        for m in matches.get(_PHP_INCLUDE_PLUGIN_DIR_PATH_RE, ()):
             tail = m.group(1)
-            found = _find_upwards_for_tail(page, tail)
-            if found and found.suffix.lower() == '.php':
+            found = _find_upwards_for_tail(page, tail.lstrip('/'), suffix='.php')
+            if found:
                 includes.append(found)
         # get_template_directory() . '/inc/foo.php' or get_stylesheet_directory()
-        for m in php_include_theme_dir.finditer(txt):
+        for m in matches.get(_PHP_INCLUDE_THEME_DIR_RE, ()):
             tail = m.group(1)
-            found = _find_upwards_for_tail(page, tail)
-            if found and found.suffix.lower() == '.php':
+            found = _find_upwards_for_tail(page, tail.lstrip('/'), suffix='.php')
+            if found:
                 includes.append(found)
+        return php_scan_memo.setdefault(page, (css_found, includes, registered, handles))
+
+    def _scan_php_for_css(page: Path, visited: Set[Path], handle_map: Dict[str, Path], enqueued_handles: Set[str], txt: str | None = None) -> Tuple[List[Path], List[Path]]:
+        """Return (css_files, included_php_files) found in a PHP file. Updates handle_map and enqueued_handles in place."""
+        if page in visited:
+            return [], []
+        visited.add(page)
+        css_found, includes, registered, handles = _scan_php_file(page, txt)
+        handle_map.update(registered)
+        enqueued_handles.update(handles)
         return css_found, includes
 
-    for page in page_files:
+    def _scan_page(page: Path) -> Tuple[List[str], List[Path]]:
+        """Return (css_chain, page_js) for one page.
+
+        Runs on pool threads. Apart from its own locals it only fills memo
+        dicts (imports_cache, php_scan_memo, the module-level import chain
+        and file caches), whose values are identical for a given key whichever
+        thread computes them.
+        """
         content = read_file_content(page)
         # Ordered <link> tags
-        hrefs = link_pattern.findall(content)
+        hrefs = _LINK_RE.findall(content)
         css_chain: List[str] = []
 
         for href in hrefs:
             p = _resolve_path(page, href)
             if p and p.suffix.lower() in DEFAULT_CSS_EXTENSIONS and allowed(p):
                 # Resolve imports for this stylesheet
-                flattened = resolve_css_imports(p)
+                flattened = resolve_css_imports(p, imports_cache)
                 for f in flattened:
                     if not allowed(f):
                         continue
-                    css_chain.append(str(f.resolve()))
-                    all_css.add(str(f.resolve()))
+                    css_chain.append(_canon(f))
 
         # Inline <style> @import
-        for import_href in style_import_pattern.findall(content):
+        for import_href in _STYLE_IMPORT_RE.findall(content):
             p = _resolve_path(page, import_href)
             if p and p.suffix.lower() in DEFAULT_CSS_EXTENSIONS and allowed(p):
-                flattened = resolve_css_imports(p)
+                flattened = resolve_css_imports(p, imports_cache)
                 for f in flattened:
                     if not allowed(f):
                         continue
-                    css_chain.append(str(f.resolve()))
-                    all_css.add(str(f.resolve()))
+                    css_chain.append(_canon(f))
 
         # If PHP file, scan for enqueued CSS and included PHP files (recursive)
         if page.suffix.lower() == '.php':
@@ -669,19 +963,24 @@ def parse_html_for_css(path: Path, exclude_dirs: Set[str] = None, whitelist: Lis
             max_depth = 2  # prevent deep recursion
             handle_map: Dict[str, Path] = {}
             enqueued_handles: Set[str] = set()
+            # Stylesheets already chained from a wp_*_style call site; a
+            # registered handle pointing at one of them is not listed again
+            direct_css: Set[Path] = set()
             while to_scan and depth <= max_depth:
                 next_round: List[Path] = []
                 for php_file in to_scan:
-                    css_paths, includes = _scan_php_for_css(php_file, visited_php, handle_map, enqueued_handles)
+                    # The page itself was read above; included files are read on demand
+                    css_paths, includes = _scan_php_for_css(php_file, visited_php, handle_map, enqueued_handles,
+                                                            content if php_file is page else None)
                     for cp in css_paths:
                         if not allowed(cp):
                             continue
-                        flattened = resolve_css_imports(cp)
+                        direct_css.add(cp)
+                        flattened = resolve_css_imports(cp, imports_cache)
                         for f in flattened:
                             if not allowed(f):
                                 continue
-                            css_chain.append(str(f.resolve()))
-                            all_css.add(str(f.resolve()))
+                            css_chain.append(_canon(f))
                     for inc in includes:
                         if inc not in visited_php and allowed(inc):
                             next_round.append(inc)
@@ -690,55 +989,71 @@ def parse_html_for_css(path: Path, exclude_dirs: Set[str] = None, whitelist: Lis
             # After scanning all related PHP files, resolve any enqueued handles
             for h in sorted(enqueued_handles):
                 pth = handle_map.get(h)
+                if pth in direct_css:
+                    continue
                 if pth and pth.exists() and allowed(pth):
-                    flattened = resolve_css_imports(pth)
+                    flattened = resolve_css_imports(pth, imports_cache)
                     for f in flattened:
                         if not allowed(f):
                             continue
-                        css_chain.append(str(f.resolve()))
-                        all_css.add(str(f.resolve()))
+                        css_chain.append(_canon(f))
 
         # JS included scripts for this page
-        js_srcs = script_src_pattern.findall(content)
+        js_srcs = _SCRIPT_SRC_RE.findall(content)
         page_js: List[Path] = []
         for js in js_srcs:
             jp = _resolve_path(page, js)
             if jp and jp.suffix.lower() in {'.js', '.mjs'} and jp.exists() and allowed(jp):
                 page_js.append(jp)
+        return css_chain, page_js
+
+    # Pages are independent and mostly wait on file reads, so scan them on a
+    # pool; map() keeps results in page order for a deterministic merge.
+    # _scan_page may only write memo entries that are idempotent per key;
+    # anything else (all_css, pages, ...) is merged below on this thread.
+    workers = min(_WALK_THREADS, len(page_files))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            scanned = list(pool.map(_scan_page, page_files))
+    else:
+        scanned = [_scan_page(page) for page in page_files]
+    for page, (css_chain, page_js) in zip(page_files, scanned):
+        all_css.update(css_chain)
         js_files_for_pages[page] = page_js
-
         pages[str(page)] = {
             'css_chain': css_chain,
             'uncertain_css': []  # fill later
         }
 
-    # Very naive dynamic detection inside JS: look for href assignments or link creation
+    # Very naive dynamic detection inside JS: look for href assignments or link creation.
+    # Pages share scripts, so read each referenced file once, concurrently
+    js_contents = read_many(sorted({jp for js_paths in js_files_for_pages.values() for jp in js_paths}))
     for page, js_paths in js_files_for_pages.items():
         uncertain: Set[str] = set()
         for jp in js_paths:
-            js_content = read_file_content(jp)
+            js_content = js_contents[jp]
             if not js_content:
                 continue
             # If code mentions link creation and sets href, mark as uncertain
-            if any(patt.search(js_content) for patt in js_dynamic_link_patterns):
+            if any(patt.search(js_content) for patt in _JS_DYNAMIC_LINK_PATTERNS):
                 # Try to extract explicit href values
-                for m in js_dynamic_link_patterns[2].finditer(js_content):
+                for m in _JS_DYNAMIC_LINK_PATTERNS[2].finditer(js_content):
                     href = m.group(1)
                     p = _resolve_path(jp, href)
                     if p and p.suffix.lower() in DEFAULT_CSS_EXTENSIONS and allowed(p):
-                        uncertain.add(str(p.resolve()))
+                        uncertain.add(_canon(p.resolve()))
         if str(page) in pages:
             pages[str(page)]['uncertain_css'] = sorted(uncertain)
             for u in uncertain:
                 all_css.add(u)
 
     # Determine unreferenced CSS: all CSS on filesystem under path minus discovered
-    all_fs_css = set(str(p.resolve()) for p in _iter_files(path, DEFAULT_CSS_EXTENSIONS, exclude_dirs) if allowed(p))
-    unreferenced_css = sorted(all_fs_css - set(all_css))
+    all_fs_css = {_canon(resolved) for f, resolved, _ in workspace_css if allowed(f)}
+    unreferenced_css = sorted(all_fs_css - all_css)
 
     return {
         'pages': pages,
-        'all_css': sorted(set(all_css)),
+        'all_css': sorted(all_css),
         'unreferenced_css': unreferenced_css
     }
 
@@ -749,18 +1064,15 @@ def get_file_size(file_path: Path) -> int:
     except OSError:
         return 0
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
     if size_bytes == 0:
         return "0 B"
-    
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
-    
-    return f"{size_bytes:.1f} {size_names[i]}"
+    # Unit index is floor(log1024(size)), read off the bit length
+    i = min(max(int(size_bytes).bit_length() - 1, 0) // 10, 4) if size_bytes > 0 else 0
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
 
 def read_file_content(file_path: Path, encoding: str = 'utf-8') -> str:
     """
@@ -773,18 +1085,85 @@ def read_file_content(file_path: Path, encoding: str = 'utf-8') -> str:
     Returns:
         File content as string, or empty string if error
     """
+    # Page parsing reads the same PHP/CSS files several times (defines, includes,
+    # import chains), so decoded text is cached until the file's mtime or size changes
     try:
-        with open(file_path, 'r', encoding=encoding) as f:
-            return f.read()
-    except (UnicodeDecodeError, IOError):
-        # Try with different encodings
-        for alt_encoding in ['latin-1', 'cp1252', 'utf-16']:
-            try:
-                with open(file_path, 'r', encoding=alt_encoding) as f:
-                    return f.read()
-            except IOError:
-                continue
+        st = os.stat(file_path)
+    except OSError:
+        return ""
+    return _read_file_cached(os.fspath(file_path), st.st_mtime_ns, st.st_size, encoding)
+
+@lru_cache(maxsize=4096)
+def _read_file_cached(file_path: str, mtime_ns: int, size: int, encoding: str) -> str:
+    """Read and decode a file; the stat fields are only part of the cache key."""
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError:
         return ""
+    return _decode_text(data, encoding)
+
+def clear_content_cache() -> None:
+    """Forget file contents cached by read_file_content."""
+    _read_file_cached.cache_clear()
+
+# Leading bytes checked for NUL when sniffing for binary files; the scan is a
+# single memchr, so a wider window is cheap and catches NULs after a text header
+_BINARY_PROBE_SIZE = 8192
+
+def read_text_if_not_binary(file_path: Path, encoding: str = 'utf-8') -> str | None:
+    """
+    Read a file's text unless it looks binary, opening it only once.
+    
+    Args:
+        file_path: Path to the file
+        encoding: File encoding (default: utf-8)
+        
+    Returns:
+        File content as string, None if the file is binary, or empty string if error
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return ""
+    # Same sniff as is_binary_file, applied to the bytes already read
+    if data.find(b'\x00', 0, _BINARY_PROBE_SIZE) != -1:
+        return None
+    return _decode_text(data, encoding)
+
+def _decode_text(data: bytes, encoding: str) -> str:
+    """Decode file bytes like text-mode reading, trying fallback encodings in memory."""
+    for enc in (encoding, 'latin-1', 'cp1252', 'utf-16'):
+        try:
+            text = data.decode(enc)
+        except UnicodeDecodeError:
+            continue
+        # Match text-mode universal newlines
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
+    return ""
+
+def read_many(paths: List[Path], max_workers: int | None = None) -> Dict[Path, str]:
+    """
+    Read several files concurrently with read_file_content.
+    
+    File reads release the GIL, so overlapping them keeps the disk busy while
+    earlier contents are decoded.
+    
+    Args:
+        paths: Files to read
+        max_workers: Thread count (defaults to the directory walk thread count)
+        
+    Returns:
+        Dictionary mapping each path to its content, in the order of paths
+    """
+    workers = min(max_workers or _WALK_THREADS, len(paths))
+    if workers <= 1:
+        return {p: read_file_content(p) for p in paths}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(read_file_content, paths)))
 
 def is_binary_file(file_path: Path) -> bool:
     """
@@ -796,25 +1175,32 @@ def is_binary_file(file_path: Path) -> bool:
     Returns:
         True if file is binary, False otherwise
     """
+    # Raw fd read: no BufferedReader or isatty probe for a one-off sniff
     try:
-        with open(file_path, 'rb') as f:
-            chunk = f.read(1024)
-            return b'\x00' in chunk
-    except IOError:
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    except OSError:
         return False
+    try:
+        chunk = os.read(fd, _BINARY_PROBE_SIZE)
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+    return chunk.find(b'\x00') != -1
 
-def get_file_info(file_path: Path) -> dict:
+def get_file_info(file_path: Path, stat_result: os.stat_result | None = None) -> dict:
     """
     Get comprehensive file information.
     
     Args:
         file_path: Path to the file
+        stat_result: Already-fetched stat for the file (e.g. DirEntry.stat()), to skip a stat call
         
     Returns:
         Dictionary with file information
     """
     try:
-        stat = file_path.stat()
+        stat = stat_result if stat_result is not None else file_path.stat()
         return {
             'name': file_path.name,
             'path': str(file_path),
@@ -844,27 +1230,24 @@ def find_files_by_pattern(path: Path, pattern: str, exclude_dirs: Set[str] = Non
     Args:
         path: Path to search in
         pattern: Pattern to match (e.g., '*.css')
-        exclude_dirs: Set of directory names to exclude from search
+        exclude_dirs: Directory names, name globs or trailing path rules to exclude from search
         
     Returns:
         List of matching file paths
     """
-    if exclude_dirs is None:
-        exclude_dirs = DEFAULT_EXCLUDE_DIRS
+    exclude_dirs = _exclude_set(exclude_dirs)
+    # Translate the glob once instead of fnmatch.fnmatch()'s per-name normcase
+    # and cache lookup; case-insensitive where normcase would fold case
+    flags = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+    match = re.compile(fnmatch.translate(pattern), flags).match
     
     matching_files = []
     
     if path.is_file():
-        if fnmatch.fnmatch(path.name, pattern):
+        if match(path.name):
             matching_files.append(path)
     elif path.is_dir():
-        for root, dirs, files in os.walk(path):
-            # Remove excluded directories
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            
-            for file in files:
-                if fnmatch.fnmatch(file, pattern):
-                    matching_files.append(Path(root) / file)
+        matching_files = _walk_files(path, match, exclude_dirs)
     
     return sorted(matching_files)
 
@@ -884,47 +1267,58 @@ def create_directory(path: Path) -> bool:
     except OSError:
         return False
 
-def is_valid_css_file(file_path: Path) -> bool:
+def _is_text_file_with_ext(file_path: Path, extensions: Set[str], strict: bool = False) -> bool:
+    """Extension check first (no I/O), then one stat; the binary sniff only when strict."""
+    if file_path.suffix.lower() not in extensions:
+        return False
+    if not file_path.is_file():
+        return False
+    return not (strict and is_binary_file(file_path))
+
+def _is_text_dirent_with_ext(entry: os.DirEntry, extensions: Set[str], strict: bool = False) -> bool:
+    """DirEntry variant of _is_text_file_with_ext; the file check comes from the scandir cache."""
+    if _suffix(entry.name) not in extensions:
+        return False
+    try:
+        if not entry.is_file():
+            return False
+    except OSError:
+        return False
+    return not (strict and is_binary_file(entry.path))
+
+def is_valid_css_dirent(entry: os.DirEntry, strict: bool = False) -> bool:
+    """Check if an os.scandir entry is a valid CSS file without re-statting it."""
+    return _is_text_dirent_with_ext(entry, DEFAULT_CSS_EXTENSIONS, strict)
+
+def is_valid_source_dirent(entry: os.DirEntry, strict: bool = False) -> bool:
+    """Check if an os.scandir entry is a valid source file (HTML, PHP, JS) without re-statting it."""
+    return _is_text_dirent_with_ext(entry, DEFAULT_SOURCE_EXTENSIONS, strict)
+
+def is_valid_css_file(file_path: Path, strict: bool = False) -> bool:
     """
     Check if a file is a valid CSS file.
     
     Args:
         file_path: Path to the file
+        strict: Also open the file and reject it if it looks binary
         
     Returns:
         True if file is a valid CSS file, False otherwise
     """
-    if not file_path.is_file():
-        return False
-    
-    if file_path.suffix.lower() not in DEFAULT_CSS_EXTENSIONS:
-        return False
-    
-    if is_binary_file(file_path):
-        return False
-    
-    return True
+    return _is_text_file_with_ext(file_path, DEFAULT_CSS_EXTENSIONS, strict)
 
-def is_valid_source_file(file_path: Path) -> bool:
+def is_valid_source_file(file_path: Path, strict: bool = False) -> bool:
     """
     Check if a file is a valid source file (HTML, PHP, JS).
     
     Args:
         file_path: Path to the file
+        strict: Also open the file and reject it if it looks binary
         
     Returns:
         True if file is a valid source file, False otherwise
     """
-    if not file_path.is_file():
-        return False
-    
-    if file_path.suffix.lower() not in DEFAULT_SOURCE_EXTENSIONS:
-        return False
-    
-    if is_binary_file(file_path):
-        return False
-    
-    return True
+    return _is_text_file_with_ext(file_path, DEFAULT_SOURCE_EXTENSIONS, strict)
 
 def get_project_root(path: Path) -> Path:
     """
@@ -936,33 +1330,46 @@ def get_project_root(path: Path) -> Path:
     Returns:
         Path to the project root, or the original path if no root found
     """
-    current_path = path.absolute()
-    
-    # Look for common project root indicators
-    root_indicators = {
-        'package.json',
-        'composer.json',
-        'requirements.txt',
-        'setup.py',
-        'pyproject.toml',
-        'Gemfile',
-        'pom.xml',
-        'build.gradle',
-        '.git',
-        '.svn',
-        '.hg'
-    }
-    
-    while current_path != current_path.parent:
-        # Check if current directory contains any root indicators
-        for indicator in root_indicators:
-            if (current_path / indicator).exists():
-                return current_path
-        
-        current_path = current_path.parent
-    
+    root = _find_project_root(str(path.absolute()))
     # If no root found, return the original path
-    return path.absolute()
+    return Path(root) if root else path.absolute()
+
+# Look for common project root indicators
+_ROOT_INDICATORS = frozenset({
+    'package.json',
+    'composer.json',
+    'requirements.txt',
+    'setup.py',
+    'pyproject.toml',
+    'Gemfile',
+    'pom.xml',
+    'build.gradle',
+    '.git',
+    '.svn',
+    '.hg'
+})
+
+@lru_cache(maxsize=4096)
+def _find_project_root(abs_path: str) -> str | None:
+    """Return the nearest directory at or above abs_path holding a root indicator.
+
+    Memoised per directory, so paths sharing an ancestor chain only stat each
+    ancestor once per run.
+    """
+    current_path = Path(abs_path)
+    if current_path == current_path.parent:
+        return None
+    # One directory listing instead of a stat per indicator; matches are then
+    # confirmed with exists() so dangling symlinks still don't count
+    try:
+        with os.scandir(abs_path) as it:
+            candidates = _ROOT_INDICATORS.intersection([entry.name for entry in it])
+    except OSError:
+        candidates = _ROOT_INDICATORS
+    for indicator in candidates:
+        if (current_path / indicator).exists():
+            return abs_path
+    return _find_project_root(str(current_path.parent))
 
 def clean_css_selector(selector: str) -> str:
     """
@@ -974,17 +1381,12 @@ def clean_css_selector(selector: str) -> str:
     Returns:
         Cleaned selector
     """
-    # Remove extra whitespace
-    selector = ' '.join(selector.split())
-    
-    # Remove newlines and tabs
-    selector = selector.replace('\n', ' ').replace('\t', ' ')
-    
-    # Normalize multiple spaces
-    while '  ' in selector:
-        selector = selector.replace('  ', ' ')
-    
-    return selector.strip()
+    # split() breaks on any whitespace run (spaces, tabs, newlines), so this
+    # both collapses internal whitespace and trims the ends
+    return ' '.join(selector.split())
+
+_CLASS_NAME_RE = re.compile(r'\.([a-zA-Z0-9_-]+)')
+_ID_NAME_RE = re.compile(r'#([a-zA-Z0-9_-]+)')
 
 def extract_class_names(selector: str) -> List[str]:
     """
@@ -996,13 +1398,8 @@ def extract_class_names(selector: str) -> List[str]:
     Returns:
         List of class names
     """
-    import re
-    
     # Find all class selectors (e.g., .class-name)
-    class_pattern = r'\.([a-zA-Z0-9_-]+)'
-    class_matches = re.findall(class_pattern, selector)
-    
-    return class_matches
+    return _CLASS_NAME_RE.findall(selector)
 
 def extract_id_names(selector: str) -> List[str]:
     """
@@ -1014,10 +1411,5 @@ def extract_id_names(selector: str) -> List[str]:
     Returns:
         List of ID names
     """
-    import re
-    
     # Find all ID selectors (e.g., #id-name)
-    id_pattern = r'#([a-zA-Z0-9_-]+)'
-    id_matches = re.findall(id_pattern, selector)
-    
-    return id_matches
\ No newline at end of file
+    return _ID_NAME_RE.findall(selector)
\ No newline at end of file